@@ -0,0 +1,430 @@
+import argparse
+import hashlib
+import math
+import unicodedata
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from parquet_pipeline import iter_token_lists, tokenize_paragraph
+
+# ==============================
+# CONFIG – change paths if needed
+# ==============================
+SCRIPT_DIR = Path(__file__).parent
+INPUT_FILES = [SCRIPT_DIR / "telugu_dataset.txt"]   # raw text, one paragraph per line
+
+# "text":      raw paragraphs, split/tokenized with the Assignment-1 patterns
+# "parquet":   `tokens` column of parquet_pipeline.py output
+# "tokenized": one pre-tokenized sentence per line, tokens separated by spaces
+INPUT_FORMATS = ("text", "parquet", "tokenized")
+
+HLL_PRECISION = 14        # 2^14 registers -> ~0.8% standard error on type counts
+CMS_WIDTH     = 1 << 20   # Count-Min columns
+CMS_DEPTH     = 4         # Count-Min rows
+HEAVY_HITTERS = 5000      # candidate words kept for top-k / stopword queries in approximate mode
+
+
+def _hash64(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def char_class(ch):
+    """
+    Buckets a character for the character-level analysis.
+    Returns: one of 'telugu', 'digit', 'latin', 'punct', 'space', 'other'
+    """
+    if "\u0C00" <= ch <= "\u0C7F":
+        return "telugu"
+    if ch.isdigit():
+        return "digit"
+    if ch.isascii() and ch.isalpha():
+        return "latin"
+    if ch.isspace():
+        return "space"
+    if unicodedata.category(ch).startswith("P"):
+        return "punct"
+    return "other"
+
+
+# -----------------------------
+# Sketches
+# -----------------------------
+class HyperLogLog:
+    """
+    Distinct-count sketch: 2^p one-byte registers, mergeable by max.
+    """
+
+    def __init__(self, p=HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add_hash(self, h):
+        idx = h >> (64 - self.p)
+        rest = (h << self.p) & ((1 << 64) - 1)
+        rank = 64 - self.p + 1 if rest == 0 else 65 - rest.bit_length()
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def add(self, token):
+        self.add_hash(_hash64(token))
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # small-range correction (linear counting)
+            return m * math.log(m / zeros)
+        return estimate
+
+
+class CountMinSketch:
+    """
+    Frequency sketch: depth x width counters, never under-estimates,
+    mergeable by element-wise addition.
+    """
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _columns(self, h):
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add_hash(self, h, count=1):
+        """Adds count and returns the new estimate for the item."""
+        est = None
+        for row, col in zip(self.rows, self._columns(h)):
+            row[col] += count
+            if est is None or row[col] < est:
+                est = row[col]
+        return est
+
+    def estimate_hash(self, h):
+        return min(row[col] for row, col in zip(self.rows, self._columns(h)))
+
+    def estimate(self, token):
+        return self.estimate_hash(_hash64(token))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge Count-Min sketches with different shapes")
+        for row, other_row in zip(self.rows, other.rows):
+            for col in range(self.width):
+                if other_row[col]:
+                    row[col] += other_row[col]
+
+
+# -----------------------------
+# Accumulator
+# -----------------------------
+class CorpusStats:
+    """
+    One-pass accumulator for the Assignment 1 corpus statistics and the
+    Assignment 3 stopword analysis.
+
+    approximate=False keeps an exact Counter of types.
+    approximate=True keeps a HyperLogLog for the type count and a
+    Count-Min sketch plus a bounded heavy-hitter set for frequencies, so
+    memory does not grow with the vocabulary.
+    """
+
+    def __init__(self, approximate=False, lowercase=False, heavy_hitters=HEAVY_HITTERS,
+                 hll_precision=HLL_PRECISION, cms_width=CMS_WIDTH, cms_depth=CMS_DEPTH):
+        self.approximate = approximate
+        self.lowercase = lowercase
+        self.heavy_hitters = heavy_hitters
+
+        self.n_sentences = 0
+        self.n_tokens = 0
+        self.n_token_chars = 0
+        self.max_sentence_length = 0
+        self.sentence_lengths = Counter()   # length -> number of sentences
+        self.chars = Counter()              # character -> count (bounded by the alphabet)
+
+        if approximate:
+            self.freq = None
+            self.hll = HyperLogLog(hll_precision)
+            self.cms = CountMinSketch(cms_width, cms_depth)
+            self.candidates = {}            # token -> estimated count
+        else:
+            self.freq = Counter()
+
+        self._sorted = None                 # cached (token, count) list, descending
+
+    # ---- updates ----
+    def add_sentence(self, tokens):
+        """
+        tokens: list of tokens of one sentence
+        """
+        n = len(tokens)
+        self.n_sentences += 1
+        self.n_tokens += n
+        self.sentence_lengths[n] += 1
+        if n > self.max_sentence_length:
+            self.max_sentence_length = n
+        self._sorted = None
+
+        chars = self.chars
+        for tok in tokens:
+            self.n_token_chars += len(tok)
+            chars.update(tok)
+            if self.lowercase:
+                tok = tok.lower()
+            if self.approximate:
+                self._add_approx(tok)
+            else:
+                self.freq[tok] += 1
+
+    def _add_approx(self, tok):
+        h = _hash64(tok)
+        self.hll.add_hash(h)
+        est = self.cms.add_hash(h)
+        self.candidates[tok] = est
+        if len(self.candidates) >= 2 * self.heavy_hitters:
+            self._prune_candidates()
+
+    def _prune_candidates(self):
+        keep = sorted(self.candidates.items(), key=lambda x: x[1], reverse=True)
+        self.candidates = dict(keep[:self.heavy_hitters])
+
+    def add_sentences(self, sentences):
+        for tokens in sentences:
+            self.add_sentence(tokens)
+        return self
+
+    def merge(self, other):
+        """
+        Folds another shard's accumulator into this one.
+        Both must have been created with the same settings.
+        """
+        if other.approximate != self.approximate:
+            raise ValueError("cannot merge exact and approximate CorpusStats")
+        self.n_sentences += other.n_sentences
+        self.n_tokens += other.n_tokens
+        self.n_token_chars += other.n_token_chars
+        self.max_sentence_length = max(self.max_sentence_length, other.max_sentence_length)
+        self.sentence_lengths.update(other.sentence_lengths)
+        self.chars.update(other.chars)
+        if self.approximate:
+            self.hll.merge(other.hll)
+            self.cms.merge(other.cms)
+            for tok in set(self.candidates) | set(other.candidates):
+                self.candidates[tok] = self.cms.estimate(tok)
+            if len(self.candidates) > self.heavy_hitters:
+                self._prune_candidates()
+        else:
+            self.freq.update(other.freq)
+        self._sorted = None
+        return self
+
+    # ---- statistics ----
+    @property
+    def unique_tokens(self):
+        if self.approximate:
+            return int(round(self.hll.estimate()))
+        return len(self.freq)
+
+    @property
+    def char_classes(self):
+        classes = Counter()
+        for ch, count in self.chars.items():
+            classes[char_class(ch)] += count
+        return classes
+
+    @property
+    def ttr(self):
+        return self.unique_tokens / self.n_tokens if self.n_tokens else 0
+
+    @property
+    def average_word_length(self):
+        return self.n_token_chars / self.n_tokens if self.n_tokens else 0
+
+    @property
+    def average_sentence_length(self):
+        return self.n_tokens / self.n_sentences if self.n_sentences else 0
+
+    def sentence_length_percentile(self, q):
+        """
+        q in [0, 100]. Returns the sentence length at that percentile.
+        """
+        if not self.n_sentences:
+            return 0
+        target = q / 100 * self.n_sentences
+        seen = 0
+        for length in sorted(self.sentence_lengths):
+            seen += self.sentence_lengths[length]
+            if seen >= target:
+                return length
+        return self.max_sentence_length
+
+    def frequency(self, token):
+        if self.lowercase:
+            token = token.lower()
+        if self.approximate:
+            return self.cms.estimate(token)
+        return self.freq[token]
+
+    # ---- frequency / stopword queries ----
+    def sorted_frequencies(self):
+        """
+        (token, count) sorted by descending count, computed once and cached.
+        In approximate mode only the heavy-hitter candidates are listed.
+        """
+        if self._sorted is None:
+            items = self.candidates.items() if self.approximate else self.freq.items()
+            self._sorted = sorted(items, key=lambda x: x[1], reverse=True)
+            # ascending negated counts for bisect in get_stopwords
+            self._neg_counts = [-c for _, c in self._sorted]
+        return self._sorted
+
+    def most_common(self, k):
+        return self.sorted_frequencies()[:k]
+
+    def get_stopwords(self, threshold):
+        """
+        Same as get_stopwords in U23AI059_Lab3_Q2.ipynb: words with count > threshold.
+        Uses the cached sorted list, so each threshold is a binary search.
+        """
+        ranked = self.sorted_frequencies()
+        cut = bisect_right(self._neg_counts, -threshold - 1)
+        return {w for w, _ in ranked[:cut]}
+
+    def remove_stopwords(self, threshold, k=None):
+        """
+        Same as remove_stopwords in U23AI059_Lab3_Q2.ipynb: sorted (word, count)
+        with every word above the threshold dropped, optionally only the top k.
+        """
+        ranked = self.sorted_frequencies()
+        cut = bisect_right(self._neg_counts, -threshold - 1)
+        end = None if k is None else cut + k
+        return ranked[cut:end]
+
+    def summary(self):
+        return {
+            "sentences": self.n_sentences,
+            "tokens": self.n_tokens,
+            "unique_tokens": self.unique_tokens,
+            "token_characters": self.n_token_chars,
+            "average_word_length": self.average_word_length,
+            "average_sentence_length": self.average_sentence_length,
+            "ttr": self.ttr,
+            "char_classes": dict(self.char_classes),
+            "approximate": self.approximate,
+        }
+
+
+# -----------------------------
+# Shards
+# -----------------------------
+def input_format(path):
+    return "parquet" if Path(path).suffix == ".parquet" else "text"
+
+
+def iter_tokenized_sentences(path, fmt=None):
+    """
+    fmt: one of INPUT_FORMATS (default: by file suffix, .parquet or raw text)
+    Raw text is split into sentences and tokens exactly like
+    parquet_pipeline.py, so the statistics match the Assignment-1 tokenization.
+    Parquet is read one row group at a time, which also works for
+    dictionary-encoded tokens.
+    Yields: list of tokens
+    """
+    fmt = fmt or input_format(path)
+    if fmt == "parquet":
+        for tokens in iter_token_lists(path):
+            if tokens:
+                yield tokens
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if fmt == "tokenized":
+                tokens = line.split()
+                if tokens:
+                    yield tokens
+            else:
+                paragraph = line.strip()
+                if paragraph:
+                    yield from tokenize_paragraph(paragraph)
+
+
+def stats_for_file(path, approximate=False, lowercase=False, fmt=None):
+    """Builds the accumulator for one shard (runs in a worker process)."""
+    return CorpusStats(approximate=approximate, lowercase=lowercase).add_sentences(
+        iter_tokenized_sentences(path, fmt)
+    )
+
+
+def stats_for_files(paths, approximate=False, lowercase=False, workers=None, fmt=None):
+    """
+    One accumulator per file, built in parallel and merged.
+    Returns: CorpusStats
+    """
+    paths = list(paths)
+    total = CorpusStats(approximate=approximate, lowercase=lowercase)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(stats_for_file, p, approximate, lowercase, fmt) for p in paths]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One-pass corpus statistics")
+    parser.add_argument("files", nargs="*", default=INPUT_FILES,
+                        help="shards: raw text (one paragraph per line), .parquet, "
+                             "or pre-tokenized text with --input-format tokenized")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, default=None,
+                        help="default: parquet for .parquet files, otherwise text")
+    parser.add_argument("--approximate", action="store_true",
+                        help="HyperLogLog / Count-Min mode (constant memory)")
+    parser.add_argument("--lowercase", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--thresholds", type=int, nargs="*", default=[100, 300, 500])
+    args = parser.parse_args()
+
+    stats = stats_for_files(args.files, approximate=args.approximate,
+                            lowercase=args.lowercase, workers=args.workers,
+                            fmt=args.input_format)
+
+    print("Corpus Statistics:")
+    print("=" * 60)
+    print(f"Number of sentences: {stats.n_sentences:,}")
+    print(f"Total words/tokens: {stats.n_tokens:,}")
+    print(f"Unique tokens: {stats.unique_tokens:,}" + (" (approx.)" if stats.approximate else ""))
+    # sum of token lengths; the notebook's "Number of characters" counts
+    # char_pattern matches over the raw text instead (including spaces)
+    print(f"Characters in tokens: {stats.n_token_chars:,}")
+    print(f"Average word length: {stats.average_word_length:.2f}")
+    print(f"Average sentence length: {stats.average_sentence_length:.2f} tokens")
+    print(f"Median / p99 sentence length: {stats.sentence_length_percentile(50)} / "
+          f"{stats.sentence_length_percentile(99)}")
+    print(f"Type-Token Ratio (TTR): {stats.ttr:.4f}")
+    print("Character classes:", dict(stats.char_classes.most_common()))
+    print("=" * 60)
+
+    print("\nTop 20 words:")
+    for w, c in stats.most_common(20):
+        print(w, ":", c)
+
+    for th in args.thresholds:
+        print(f"\nStopwords (threshold={th}): {len(stats.get_stopwords(th))}")
+        print("Top 10 after removal:", stats.remove_stopwords(th, k=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# ==============================
+# CONFIG – change paths if needed
+# ==============================
+SCRIPT_DIR = Path(__file__).parent
+DATASET_FILE = SCRIPT_DIR / "telugu_dataset.txt"
+OUT_FILE     = SCRIPT_DIR / "telugu_tokenized_tokens.parquet"
+
+CHUNK_PARAGRAPHS = 2000   # paragraphs per worker task (= one row group)
+TOKENS_FORMAT    = "list"  # "list" -> list<string>, "dictionary" -> list<dictionary<int32, string>>
+
+# Same patterns as tokenized_sentences_parquet.ipynb
+sentence_pattern = re.compile(r'(?<=[.!?])\s+')
+
+token_pattern = re.compile(
+    r'\bhttps?://\S+|'                  # URLs
+    r'\b[\w\.-]+@[\w\.-]+\.\w{2,4}\b|'  # email addresses
+    r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|'   # dates (DD/MM/YYYY or DD-MM-YYYY)
+    r'\d+\.\d+|\d+|'                    # numbers (decimals and integers)
+    r'[\u0C00-\u0C7F]+|'                # Telugu script
+    r'[^\s\w\u0C00-\u0C7F]'             # punctuation
+)
+
+
+def schema_for(tokens_format):
+    if tokens_format == "list":
+        value_type = pa.string()
+    elif tokens_format == "dictionary":
+        value_type = pa.dictionary(pa.int32(), pa.string())
+    else:
+        raise ValueError(f"unknown tokens_format: {tokens_format!r}")
+    return pa.schema([
+        ("tokens", pa.list_(value_type)),
+        ("n_tokens", pa.int32()),
+    ])
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def iter_paragraph_chunks(path, chunk_size):
+    """
+    Streams the corpus (one paragraph per line) without loading it.
+    Yields: lists of at most chunk_size non-empty paragraphs.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        paragraphs = (line.strip() for line in f)
+        paragraphs = (p for p in paragraphs if p)
+        while True:
+            chunk = list(islice(paragraphs, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def tokenize_paragraph(paragraph):
+    """
+    Splits a paragraph into sentences and tokenizes them with the
+    notebook's patterns; sentences without tokens are dropped.
+    Yields: list of tokens per sentence
+    """
+    for sentence in sentence_pattern.split(paragraph):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        tokens = token_pattern.findall(sentence)
+        if tokens:
+            yield tokens
+
+
+# -----------------------------
+# Worker: split + tokenize -> Arrow batch
+# -----------------------------
+def tokenize_chunk(paragraphs, tokens_format=TOKENS_FORMAT):
+    """
+    Runs in a worker process.
+    Splits each paragraph into sentences, tokenizes them and builds the
+    Arrow record batch for the chunk, so only columnar buffers go back
+    to the parent.
+    Returns: (pa.RecordBatch, n_paragraphs)
+    """
+    flat_tokens = []
+    offsets = [0]
+    for paragraph in paragraphs:
+        for tokens in tokenize_paragraph(paragraph):
+            flat_tokens.extend(tokens)
+            offsets.append(len(flat_tokens))
+
+    values = pa.array(flat_tokens, type=pa.string())
+    if tokens_format == "dictionary":
+        values = values.dictionary_encode()
+    offsets = pa.array(offsets, type=pa.int32())
+    tokens_col = pa.ListArray.from_arrays(offsets, values)
+    lengths = pc.list_value_length(tokens_col).cast(pa.int32())
+
+    batch = pa.RecordBatch.from_arrays(
+        [tokens_col, lengths], schema=schema_for(tokens_format)
+    )
+    return batch, len(paragraphs)
+
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+def run_pipeline(in_path, out_path, workers=None, chunk_size=CHUNK_PARAGRAPHS,
+                 tokens_format=TOKENS_FORMAT, compression="snappy"):
+    """
+    Reads in_path in chunks, tokenizes chunks in a process pool and writes
+    each chunk as its own Parquet row group, in input order.
+    At most 2 * workers chunks are in flight, so memory stays flat
+    regardless of corpus size.
+    Returns: dict with paragraphs, sentences, tokens, row_groups, seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    schema = schema_for(tokens_format)
+
+    stats = {"paragraphs": 0, "sentences": 0, "tokens": 0, "row_groups": 0}
+    start = time.perf_counter()
+
+    def consume(future, writer):
+        batch, n_paragraphs = future.result()
+        if batch.num_rows:
+            writer.write_batch(batch, row_group_size=batch.num_rows)
+            stats["row_groups"] += 1
+        stats["paragraphs"] += n_paragraphs
+        stats["sentences"] += batch.num_rows
+        stats["tokens"] += len(batch.column(0).values)
+        if batch.num_rows and stats["row_groups"] % 10 == 0:
+            print(f"Processed {stats['paragraphs']:,} paragraphs, "
+                  f"{stats['sentences']:,} tokenized sentences")
+
+    with pq.ParquetWriter(out_path, schema, compression=compression) as writer, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in iter_paragraph_chunks(in_path, chunk_size):
+            pending.append(pool.submit(tokenize_chunk, chunk, tokens_format))
+            if len(pending) >= max_in_flight:
+                consume(pending.pop(0), writer)
+        for future in pending:
+            consume(future, writer)
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+# -----------------------------
+# Reading the output
+# -----------------------------
+def iter_token_lists(path):
+    """
+    Streams the tokens column of a pipeline output file one row group
+    (= one chunk) at a time, for both tokens formats.
+    Every row group of a dictionary file has its own dictionary, which
+    ParquetFile.iter_batches cannot convert across row groups, so row
+    groups are read one by one instead.
+    Yields: list of tokens per sentence
+    """
+    pf = pq.ParquetFile(path)
+    for i in range(pf.num_row_groups):
+        yield from pf.read_row_group(i, columns=["tokens"]).column(0).to_pylist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming Telugu tokenization to Parquet")
+    parser.add_argument("--input", default=DATASET_FILE)
+    parser.add_argument("--output", default=OUT_FILE)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_PARAGRAPHS,
+                        help="paragraphs per row group")
+    parser.add_argument("--tokens-format", choices=["list", "dictionary"], default=TOKENS_FORMAT)
+    args = parser.parse_args()
+
+    print(f"Tokenizing {args.input} -> {args.output}")
+    print("=" * 60)
+    stats = run_pipeline(args.input, args.output, workers=args.workers,
+                         chunk_size=args.chunk_size, tokens_format=args.tokens_format)
+    print("=" * 60)
+
+    file_size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"Total paragraphs processed: {stats['paragraphs']:,}")
+    print(f"Total tokenized sentences: {stats['sentences']:,}")
+    print(f"Total tokens: {stats['tokens']:,}")
+    print(f"Row groups: {stats['row_groups']}")
+    print(f"File size: {file_size_mb:.2f} MB")
+    print(f"Time: {stats['seconds']:.2f}s "
+          f"({stats['paragraphs'] / max(stats['seconds'], 1e-9):,.0f} paragraphs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import re
+import time
+from pathlib import Path
+
+# ==============================
+# CONFIG – change paths if needed
+# ==============================
+SCRIPT_DIR = Path(__file__).parent
+NOUNS_FILE = SCRIPT_DIR / "brown_nouns.txt"
+OUT_FILE   = SCRIPT_DIR / "noun_analysis_output.txt"
+
+# number of result lines buffered before each write
+WRITE_CHUNK = 10000
+
+# Suffix rules, in the same priority order as analyze_word in ASSIGN_2_2ND.ipynb.
+# (suffix, min_prefix, action) where action is (chars_to_strip, text_to_append)
+# or None for "not a plural, fall back to the lexicon".
+#   .*(s|x|z|ch|sh)es$   -> strip "es"
+#   .*ies$               -> "ies" => "y"
+#   .*(ss|us|is)$        -> blocks the plain -s rule
+#   .+s$                 -> strip "s"
+PLURAL_RULES = [
+    ("ses", 0, (2, "")),
+    ("xes", 0, (2, "")),
+    ("zes", 0, (2, "")),
+    ("ches", 0, (2, "")),
+    ("shes", 0, (2, "")),
+    ("ies", 0, (3, "y")),
+    ("ss", 0, None),
+    ("us", 0, None),
+    ("is", 0, None),
+    ("s", 1, (1, "")),
+]
+
+NO_MATCH = (len(PLURAL_RULES), None)   # lowest priority: lexicon lookup
+
+
+# -----------------------------
+# Reference (regex) analyzer
+# -----------------------------
+def analyze_word_regex(word, nouns):
+    """
+    Same logic as analyze_word in ASSIGN_2_2ND.ipynb.
+    nouns: collection used for the singular lookup.
+    """
+    if re.match(r".*(s|x|z|ch|sh)es$", word):
+        root = re.sub(r"es$", "", word)
+        return f"{root}+N+PL"
+
+    if re.match(r".*ies$", word):
+        root = re.sub(r"ies$", "y", word)
+        return f"{root}+N+PL"
+
+    if re.match(r".+s$", word) and not re.match(r".*(ss|us|is)$", word):
+        root = re.sub(r"s$", "", word)
+        return f"{root}+N+PL"
+
+    if word in nouns:
+        return f"{word}+N+SG"
+
+    return "Invalid Word"
+
+
+# -----------------------------
+# Compiled transducer
+# -----------------------------
+class SuffixFSTState:
+    def __init__(self):
+        self.transitions = {}
+        # output if input continues past this state without a transition
+        self.out_more = NO_MATCH
+        # output if the word ends exactly in this state
+        self.out_end = NO_MATCH
+
+
+class SuffixFST:
+    """
+    Deterministic transducer over the reversed word.
+    States are the reversed rule suffixes; each state carries the best
+    (highest priority) rule matched on the path to it, so a word is
+    analysed by a single right-to-left walk with no backtracking.
+    """
+
+    def __init__(self, rules=PLURAL_RULES):
+        self.start = SuffixFSTState()
+        self._compile(rules)
+
+    def _compile(self, rules):
+        # 1) reversed-suffix trie, remembering which rule ends at each state
+        ends_here = {}
+        for priority, (suffix, min_prefix, action) in enumerate(rules):
+            node = self.start
+            for ch in reversed(suffix):
+                node = node.transitions.setdefault(ch, SuffixFSTState())
+            ends_here.setdefault(id(node), []).append((priority, min_prefix, action))
+
+        # 2) propagate the best match from each state to its children
+        stack = [(self.start, NO_MATCH)]
+        while stack:
+            node, inherited = stack.pop()
+            best_more = inherited
+            best_end = inherited
+            for priority, min_prefix, action in ends_here.get(id(node), []):
+                if (priority, action) < best_more:
+                    best_more = (priority, action)
+                if min_prefix == 0 and (priority, action) < best_end:
+                    best_end = (priority, action)
+            node.out_more = best_more
+            node.out_end = best_end
+            # children always have at least one char before the parent suffix
+            for child in node.transitions.values():
+                stack.append((child, best_more))
+
+    def match(self, word):
+        """
+        Walks word right-to-left.
+        Returns: (chars_to_strip, text_to_append) for a plural, or None.
+        """
+        node = self.start
+        i = len(word) - 1
+        while i >= 0:
+            nxt = node.transitions.get(word[i])
+            if nxt is None:
+                return node.out_more[1]
+            node = nxt
+            i -= 1
+        return node.out_end[1]
+
+    def analyze(self, word, nouns):
+        action = self.match(word)
+        if action is not None:
+            strip, append = action
+            return f"{word[:len(word) - strip]}{append}+N+PL"
+        if word in nouns:
+            return f"{word}+N+SG"
+        return "Invalid Word"
+
+
+# -----------------------------
+# Batch / streaming API
+# -----------------------------
+def read_nouns(path):
+    """
+    Reads one noun per line (lowercased, blanks skipped).
+    Yields: str
+    """
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line.lower()
+
+
+def analyze_stream(words, nouns, fst=None):
+    """
+    words: iterable of words (duplicates allowed)
+    nouns: lexicon for the singular lookup
+    Yields (word, analysis) for each distinct word in first-seen order,
+    matching the results dict built in the notebook.
+    """
+    fst = fst or SuffixFST()
+    seen = set()
+    for word in words:
+        if word in seen:
+            continue
+        seen.add(word)
+        yield word, fst.analyze(word, nouns)
+
+
+def write_analysis(results, out_path, chunk_size=WRITE_CHUNK):
+    """
+    results: iterable of (word, analysis)
+    Writes 'word : analysis' lines, flushing in chunks of chunk_size.
+    Returns: number of lines written.
+    """
+    n = 0
+    buf = []
+    with open(out_path, "w") as f:
+        for word, analysis in results:
+            buf.append(f"{word} : {analysis}\n")
+            if len(buf) >= chunk_size:
+                f.write("".join(buf))
+                n += len(buf)
+                buf.clear()
+        if buf:
+            f.write("".join(buf))
+            n += len(buf)
+    return n
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark(words, nouns, repeat=3):
+    """
+    Times regex vs compiled FST over every word (no de-duplication).
+    Returns: (regex_seconds, fst_seconds) – best of `repeat` runs.
+    """
+    fst = SuffixFST()
+
+    best_regex = best_fst = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for w in words:
+            analyze_word_regex(w, nouns)
+        best_regex = min(best_regex, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for w in words:
+            fst.analyze(w, nouns)
+        best_fst = min(best_fst, time.perf_counter() - t0)
+
+    return best_regex, best_fst
+
+
+def main():
+    print("Loading nouns...")
+    words = list(read_nouns(NOUNS_FILE))
+    # set instead of the notebook's list so the benchmark compares matchers only
+    nouns = set(words)
+    print(f"Loaded {len(words)} nouns ({len(nouns)} distinct)")
+
+    fst = SuffixFST()
+
+    print("Checking FST against regex analyzer...")
+    mismatches = 0
+    for w in nouns:
+        if fst.analyze(w, nouns) != analyze_word_regex(w, nouns):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  MISMATCH {w}: {fst.analyze(w, nouns)} vs {analyze_word_regex(w, nouns)}")
+    print(f"Mismatches: {mismatches}")
+
+    print(f"\nWriting analysis to {OUT_FILE} ...")
+    n = write_analysis(analyze_stream(words, nouns, fst), OUT_FILE)
+    print(f"Wrote {n} lines")
+
+    print("\nBenchmarking (best of 3, all tokens)...")
+    t_regex, t_fst = benchmark(words, nouns)
+    print(f"  regex: {t_regex:.3f}s  ({len(words) / t_regex:,.0f} words/s)")
+    print(f"  fst:   {t_fst:.3f}s  ({len(words) / t_fst:,.0f} words/s)")
+    print(f"  speed-up: {t_regex / t_fst:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
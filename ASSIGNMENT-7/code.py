@@ -1,9 +1,19 @@
+import argparse
+import sys
 import numpy as np
 from pathlib import Path
 
 from scipy.sparse import load_npz
 from sklearn.metrics.pairwise import cosine_similarity
 
+import instrument
+import result_writers
+from instrument import stage
+
+# the artifact cache is shared by all assignments and lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "artifact_cache"))
+import artifact_cache  # noqa: E402
+
 # ==============================
 # CONFIG – change paths if needed
 # ==============================
@@ -22,6 +32,15 @@ OUT_TEST_NEIGHBORS_TRAIN = SCRIPT_DIR / "outputs/nearest_neighbors_test_in_train
 # for memory safety if train is big
 BATCH_SIZE = 500   # number of queries to process at once
 
+# artifact cache key of the neighbour search; bump the version whenever
+# find_nearest_neighbors_in_train changes so cached results are not reused
+NEIGHBORS_PARAMS = {"algorithm": "cosine_argmax_in_train", "version": 1,
+                    "batch_size": BATCH_SIZE}
+
+# instrumented stages (see instrument.py)
+STAGES = ("load_sentences", "load_tfidf", "similarity_val", "write_val",
+          "similarity_test", "write_test")
+
 
 def read_sentences(path):
     """
@@ -72,17 +91,15 @@ def find_nearest_neighbors_in_train(X_queries, X_train, batch_size=500):
     return neighbors
 
 
-def write_neighbors(out_path, query_sents, train_sents, neighbors):
+def write_neighbors(out_path, query_sents, train_sents, neighbors, **options):
     """
     Writes nearest neighbor info.
     Format per line:
     q_index<TAB>train_index<TAB>similarity<TAB>query_sentence<TAB>|||<TAB>train_sentence
+    options: fmt / chunk_rows / workers, see result_writers.write_neighbors
+    Returns: the path written
     """
-    with open(out_path, "w", encoding="utf-8") as f:
-        for qi, ti, sim_ij in neighbors:
-            q_sent = query_sents[qi]
-            t_sent = train_sents[ti]
-            f.write(f"{qi}\t{ti}\t{sim_ij:.4f}\t{q_sent}\t|||\t{t_sent}\n")
+    return result_writers.write_neighbors(out_path, query_sents, train_sents, neighbors, **options)
 
 
 def estimate_operations(n_queries, n_train, dim):
@@ -95,6 +112,15 @@ def estimate_operations(n_queries, n_train, dim):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Nearest TRAIN neighbours of VAL/TEST sentences")
+    instrument.add_arguments(parser, stages=STAGES)
+    result_writers.add_arguments(parser)
+    artifact_cache.add_arguments(parser)
+    args = parser.parse_args()
+    instrument.configure(args, script="code")
+    cache = artifact_cache.from_args(args)
+    write_options = {"fmt": args.format, "chunk_rows": args.chunk_rows, "workers": args.workers}
+
     # create output directory if not exists
     (SCRIPT_DIR / "outputs").mkdir(parents=True, exist_ok=True)
     
@@ -102,17 +128,21 @@ def main():
     # Load sentences
     # ==============================
     print("Loading sentences...")
-    train_sents = read_sentences(TRAIN_SENT_FILE)
-    val_sents   = read_sentences(VAL_SENT_FILE)
-    test_sents  = read_sentences(TEST_SENT_FILE)
+    with stage("load_sentences") as st:
+        train_sents = read_sentences(TRAIN_SENT_FILE)
+        val_sents   = read_sentences(VAL_SENT_FILE)
+        test_sents  = read_sentences(TEST_SENT_FILE)
+        st.rows = len(train_sents) + len(val_sents) + len(test_sents)
 
     # ==============================
     # Load TF-IDF matrices
     # ==============================
     print("Loading TF-IDF matrices...")
-    X_train = load_npz(TRAIN_TFIDF_FILE)
-    X_val   = load_npz(VAL_TFIDF_FILE)
-    X_test  = load_npz(TEST_TFIDF_FILE)
+    with stage("load_tfidf") as st:
+        X_train = load_npz(TRAIN_TFIDF_FILE)
+        X_val   = load_npz(VAL_TFIDF_FILE)
+        X_test  = load_npz(TEST_TFIDF_FILE)
+        st.rows = X_train.shape[0] + X_val.shape[0] + X_test.shape[0]
 
     print(f"Train TF-IDF shape: {X_train.shape}")
     print(f"Val   TF-IDF shape: {X_val.shape}")
@@ -132,9 +162,17 @@ def main():
     # VAL -> TRAIN (nearest neighbor)
     # ==============================
     print("\nFinding nearest neighbors: VAL sentences in TRAIN set...")
-    val_neighbors = find_nearest_neighbors_in_train(X_val, X_train, batch_size=BATCH_SIZE)
-    write_neighbors(OUT_VAL_NEIGHBORS_TRAIN, val_sents, train_sents, val_neighbors)
-    print(f"Validation->Train neighbors written to {OUT_VAL_NEIGHBORS_TRAIN}")
+    with stage("similarity_val", rows=X_val.shape[0]):
+        val_neighbors, hit = result_writers.cached_neighbors(
+            cache, "nearest_neighbors_in_train", [VAL_TFIDF_FILE, TRAIN_TFIDF_FILE],
+            NEIGHBORS_PARAMS,
+            lambda: find_nearest_neighbors_in_train(X_val, X_train, batch_size=BATCH_SIZE))
+    if hit:
+        print("  (loaded from the artifact cache)")
+    with stage("write_val", rows=len(val_neighbors)):
+        out = write_neighbors(OUT_VAL_NEIGHBORS_TRAIN, val_sents, train_sents, val_neighbors,
+                              **write_options)
+    print(f"Validation->Train neighbors written to {out}")
 
     # estimate operations for val->train
     ops_val_train = estimate_operations(X_val.shape[0], X_train.shape[0], dim)
@@ -144,9 +182,17 @@ def main():
     # TEST -> TRAIN (nearest neighbor)
     # ==============================
     print("\nFinding nearest neighbors: TEST sentences in TRAIN set...")
-    test_neighbors = find_nearest_neighbors_in_train(X_test, X_train, batch_size=BATCH_SIZE)
-    write_neighbors(OUT_TEST_NEIGHBORS_TRAIN, test_sents, train_sents, test_neighbors)
-    print(f"Test->Train neighbors written to {OUT_TEST_NEIGHBORS_TRAIN}")
+    with stage("similarity_test", rows=X_test.shape[0]):
+        test_neighbors, hit = result_writers.cached_neighbors(
+            cache, "nearest_neighbors_in_train", [TEST_TFIDF_FILE, TRAIN_TFIDF_FILE],
+            NEIGHBORS_PARAMS,
+            lambda: find_nearest_neighbors_in_train(X_test, X_train, batch_size=BATCH_SIZE))
+    if hit:
+        print("  (loaded from the artifact cache)")
+    with stage("write_test", rows=len(test_neighbors)):
+        out = write_neighbors(OUT_TEST_NEIGHBORS_TRAIN, test_sents, train_sents, test_neighbors,
+                              **write_options)
+    print(f"Test->Train neighbors written to {out}")
 
     # estimate operations for test->train
     ops_test_train = estimate_operations(X_test.shape[0], X_train.shape[0], dim)
@@ -162,7 +208,9 @@ def main():
     print(f"  TF-IDF dimension: {dim}")
     print(f"  Estimated ops VAL->TRAIN  ≈ N_val * N_train * D  = {ops_val_train:e}")
     print(f"  Estimated ops TEST->TRAIN ≈ N_test * N_train * D = {ops_test_train:e}")
+    print(cache.summary())
     print("\nDone!")
+    instrument.finish()
 
 
 if __name__ == "__main__":
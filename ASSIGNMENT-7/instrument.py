@@ -0,0 +1,217 @@
+"""
+Lightweight stage instrumentation for the ASSIGNMENT-7 scripts.
+
+    with stage("load") as st:
+        sents = read_sentences(path)
+        st.rows = len(sents)
+
+When instrumentation is off (the default) stage() returns a shared no-op
+context manager, so the scripts pay one attribute check per stage.
+When on, every stage records wall time, CPU time, peak RSS, rows and
+rows/s as one JSON line, and can be added to a Chrome trace
+(chrome://tracing or https://ui.perfetto.dev). One stage at a time can
+be run under cProfile or tracemalloc.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class _NullStage:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    def __init__(self, recorder, name, rows=None):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+        self.profiler = None
+
+    def __enter__(self):
+        rec = self.recorder
+        if rec.profile_stage == self.name:
+            if rec.profiler == "tracemalloc":
+                tracemalloc.start()
+            else:
+                self.profiler = cProfile.Profile()
+        self.rss_start = peak_rss_mb()
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        rss = peak_rss_mb()
+
+        record = {
+            "event": "stage",
+            "script": self.recorder.script,
+            "stage": self.name,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_rss_mb": round(rss, 2),
+            "peak_rss_growth_mb": round(rss - self.rss_start, 2),
+            "rows": self.rows,
+            "rows_per_s": round(self.rows / wall, 2) if self.rows and wall > 0 else None,
+            "ok": exc_type is None,
+        }
+        if self.recorder.profile_stage == self.name:
+            record["profile"] = self.recorder.dump_profile(self)
+            self.recorder.profiled = True
+        self.recorder.emit(record, self.wall_start, wall)
+        return False
+
+
+class Recorder:
+    def __init__(self):
+        self.enabled = False
+        self.script = None
+        self.log = None
+        self.trace_path = None
+        self.trace_events = []
+        self.profile_stage = None
+        self.profiler = "cprofile"
+        self.profile_dir = Path(".")
+        self.profiled = False
+        self.t0 = time.perf_counter()
+
+    def emit(self, record, start, wall):
+        line = json.dumps(record, ensure_ascii=False)
+        if self.log is not None:
+            self.log.write(line + "\n")
+            self.log.flush()
+        else:
+            print(line, file=sys.stderr)
+        if self.trace_path is not None:
+            self.trace_events.append({
+                "name": record["stage"],
+                "cat": record["script"],
+                "ph": "X",
+                "ts": (start - self.t0) * 1e6,
+                "dur": wall * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {k: record[k] for k in ("cpu_s", "peak_rss_mb", "rows", "rows_per_s")},
+            })
+
+    def dump_profile(self, st):
+        """Writes the profile of one stage next to the logs; returns its path."""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        base = f"{self.script}.{st.name}"
+        if st.profiler is not None:
+            path = self.profile_dir / f"{base}.prof"
+            st.profiler.dump_stats(path)
+            out = io.StringIO()
+            pstats.Stats(st.profiler, stream=out).sort_stats("cumulative").print_stats(20)
+            print(out.getvalue(), file=sys.stderr)
+            return str(path)
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        path = self.profile_dir / f"{base}.tracemalloc.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"current={current / 2**20:.2f} MiB peak={peak / 2**20:.2f} MiB\n")
+            for stat in snapshot.statistics("lineno")[:30]:
+                f.write(f"{stat}\n")
+        print(f"tracemalloc: peak {peak / 2**20:.2f} MiB in stage {st.name!r}, top lines in {path}",
+              file=sys.stderr)
+        return str(path)
+
+    def finish(self):
+        if self.profile_stage is not None and not self.profiled:
+            # e.g. a stage skipped on an artifact cache hit
+            print(f"instrument: stage {self.profile_stage!r} did not run, nothing was profiled",
+                  file=sys.stderr)
+        if self.trace_path is not None:
+            with open(self.trace_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+_recorder = Recorder()
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def add_arguments(parser, stages=None):
+    """
+    stages: the script's stage names; --profile-stage only accepts these
+    """
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--instrument", action="store_true",
+                       help="record per-stage wall/CPU time, peak RSS and rows/s")
+    group.add_argument("--metrics-log", type=Path, default=None,
+                       help="append JSON lines here instead of stderr (implies --instrument)")
+    group.add_argument("--trace", type=Path, default=None,
+                       help="write a Chrome trace of the stages (implies --instrument)")
+    group.add_argument("--profile-stage", default=None, choices=stages,
+                       help="run this one stage under a profiler (implies --instrument)")
+    group.add_argument("--profiler", choices=["cprofile", "tracemalloc"], default="cprofile")
+    group.add_argument("--profile-dir", type=Path, default=Path("profiles"))
+    return parser
+
+
+def configure(args, script):
+    """
+    args: namespace from a parser passed through add_arguments
+    script: name used in records and profile file names
+    """
+    rec = _recorder
+    rec.script = script
+    rec.enabled = bool(args.instrument or args.metrics_log or args.trace or args.profile_stage)
+    if not rec.enabled:
+        return
+    if args.metrics_log:
+        args.metrics_log.parent.mkdir(parents=True, exist_ok=True)
+        rec.log = open(args.metrics_log, "a", encoding="utf-8")
+    rec.trace_path = args.trace
+    rec.profile_stage = args.profile_stage
+    rec.profiler = args.profiler
+    rec.profile_dir = args.profile_dir
+
+
+def stage(name, rows=None):
+    if not _recorder.enabled:
+        return _NULL_STAGE
+    return Stage(_recorder, name, rows)
+
+
+def finish():
+    if _recorder.enabled:
+        _recorder.finish()
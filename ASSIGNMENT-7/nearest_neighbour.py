@@ -1,9 +1,19 @@
+import argparse
+import sys
 import numpy as np
 from pathlib import Path
 
 from scipy.sparse import load_npz
 from sklearn.metrics.pairwise import cosine_similarity
 
+import instrument
+import result_writers
+from instrument import stage
+
+# the artifact cache is shared by all assignments and lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "artifact_cache"))
+import artifact_cache  # noqa: E402
+
 # ==============================
 # CONFIG – change paths if needed
 # ==============================
@@ -17,6 +27,14 @@ TEST_TFIDF_FILE = SCRIPT_DIR / "outputs/tfidf_output/tfidf_test.npz"
 OUT_VAL_NEIGHBORS  = SCRIPT_DIR / "outputs/nearest_neighbors_val.txt"
 OUT_TEST_NEIGHBORS = SCRIPT_DIR / "outputs/nearest_neighbors_test.txt"
 
+# artifact cache key of the neighbour search; bump the version whenever
+# find_nearest_neighbors changes so cached results are not reused
+NEIGHBORS_PARAMS = {"algorithm": "cosine_argmax_exclude_self", "version": 1}
+
+# instrumented stages (see instrument.py)
+STAGES = ("load_val", "similarity_val", "write_val",
+          "load_test", "similarity_test", "write_test")
+
 
 def read_sentences(path):
     """
@@ -54,20 +72,27 @@ def find_nearest_neighbors(X):
     return neighbors
 
 
-def write_neighbors(out_path, sentences, neighbors):
+def write_neighbors(out_path, sentences, neighbors, **options):
     """
     Writes nearest neighbor info.
     Format per line:
     sent_index<TAB>neighbor_index<TAB>similarity<TAB>sentence<TAB>|||<TAB>neighbor_sentence
+    options: fmt / chunk_rows / workers, see result_writers.write_neighbors
+    Returns: the path written
     """
-    with open(out_path, "w", encoding="utf-8") as f:
-        for i, j, sim_ij in neighbors:
-            s_i = sentences[i]
-            s_j = sentences[j]
-            f.write(f"{i}\t{j}\t{sim_ij:.4f}\t{s_i}\t|||\t{s_j}\n")
+    return result_writers.write_neighbors(out_path, sentences, sentences, neighbors, **options)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Nearest neighbours within VAL and TEST")
+    instrument.add_arguments(parser, stages=STAGES)
+    result_writers.add_arguments(parser)
+    artifact_cache.add_arguments(parser)
+    args = parser.parse_args()
+    instrument.configure(args, script="nearest_neighbour")
+    cache = artifact_cache.from_args(args)
+    write_options = {"fmt": args.format, "chunk_rows": args.chunk_rows, "workers": args.workers}
+
     # create output directory if not exists
     (SCRIPT_DIR / "outputs").mkdir(parents=True, exist_ok=True)
     
@@ -75,37 +100,57 @@ def main():
     # VALIDATION SET
     # ==============================
     print("Loading validation sentences and TF-IDF matrix...")
-    val_sents = read_sentences(VAL_SENT_FILE)
-    X_val = load_npz(VAL_TFIDF_FILE)
+    with stage("load_val") as st:
+        val_sents = read_sentences(VAL_SENT_FILE)
+        X_val = load_npz(VAL_TFIDF_FILE)
+        st.rows = len(val_sents)
 
     if X_val.shape[0] != len(val_sents):
         print("WARNING: #rows in tfidf_val.npz does not match #lines in val.txt")
 
     print("Finding nearest neighbors in validation set...")
-    val_neighbors = find_nearest_neighbors(X_val)
-
-    print(f"Writing validation nearest neighbors to {OUT_VAL_NEIGHBORS} ...")
-    write_neighbors(OUT_VAL_NEIGHBORS, val_sents, val_neighbors)
+    with stage("similarity_val", rows=X_val.shape[0]):
+        val_neighbors, hit = result_writers.cached_neighbors(
+            cache, "nearest_neighbors", [VAL_TFIDF_FILE], NEIGHBORS_PARAMS,
+            lambda: find_nearest_neighbors(X_val))
+    if hit:
+        print("  (loaded from the artifact cache)")
+
+    out = result_writers.output_path(OUT_VAL_NEIGHBORS, args.format)
+    print(f"Writing validation nearest neighbors to {out} ...")
+    with stage("write_val", rows=len(val_neighbors)):
+        write_neighbors(OUT_VAL_NEIGHBORS, val_sents, val_neighbors, **write_options)
 
     # ==============================
     # TEST SET
     # ==============================
     print("Loading test sentences and TF-IDF matrix...")
-    test_sents = read_sentences(TEST_SENT_FILE)
-    X_test = load_npz(TEST_TFIDF_FILE)
+    with stage("load_test") as st:
+        test_sents = read_sentences(TEST_SENT_FILE)
+        X_test = load_npz(TEST_TFIDF_FILE)
+        st.rows = len(test_sents)
 
     if X_test.shape[0] != len(test_sents):
         print("WARNING: #rows in tfidf_test.npz does not match #lines in test.txt")
 
     print("Finding nearest neighbors in test set...")
-    test_neighbors = find_nearest_neighbors(X_test)
-
-    print(f"Writing test nearest neighbors to {OUT_TEST_NEIGHBORS} ...")
-    write_neighbors(OUT_TEST_NEIGHBORS, test_sents, test_neighbors)
+    with stage("similarity_test", rows=X_test.shape[0]):
+        test_neighbors, hit = result_writers.cached_neighbors(
+            cache, "nearest_neighbors", [TEST_TFIDF_FILE], NEIGHBORS_PARAMS,
+            lambda: find_nearest_neighbors(X_test))
+    if hit:
+        print("  (loaded from the artifact cache)")
+
+    out = result_writers.output_path(OUT_TEST_NEIGHBORS, args.format)
+    print(f"Writing test nearest neighbors to {out} ...")
+    with stage("write_test", rows=len(test_neighbors)):
+        write_neighbors(OUT_TEST_NEIGHBORS, test_sents, test_neighbors, **write_options)
 
     print("\nDone!")
     print(f"Validation sentences: {len(val_sents)}")
     print(f"Test sentences:       {len(test_sents)}")
+    print(cache.summary())
+    instrument.finish()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
+import argparse
 import math
+import sys
 from collections import Counter
 from pathlib import Path
 
+import instrument
+import result_writers
+from instrument import stage
+
+# the artifact cache is shared by all assignments and lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "artifact_cache"))
+import artifact_cache  # noqa: E402
+
 # -----------------------------
 # FILE NAMES (your files)
 # -----------------------------
@@ -14,6 +24,14 @@ TEST_FILE    = SCRIPT_DIR / "inputs/test.txt"
 PMI_VAL_OUT = SCRIPT_DIR / "outputs/pmi_val.txt"
 PMI_TEST_OUT = SCRIPT_DIR / "outputs/pmi_test.txt"
 
+# artifact cache key of the parsed models; bump the version whenever
+# load_unigram_model / load_bigram_model change
+MODELS_PARAMS = {"loader": "load_unigram_model+load_bigram_model", "version": 1}
+
+# instrumented stages (see instrument.py)
+STAGES = ("load_models", "load_val", "pmi_val", "write_val",
+          "load_test", "pmi_test", "write_test")
+
 
 # -----------------------------
 # Load models
@@ -129,41 +147,71 @@ def compute_pmi_for_bigrams(bigram_counts, P_unigram, P_bigram):
     return pmi_scores
 
 
-def write_pmi_to_file(pmi_scores, out_path):
+def write_pmi_to_file(pmi_scores, out_path, **options):
     """
     Writes: 'w1 w2<TAB>PMI', sorted by descending PMI.
+    More than run_rows entries are sorted externally (sorted runs on disk + merge).
+    options: fmt / chunk_rows / workers / run_rows / tmp_dir, see result_writers.write_pmi
+    Returns: the path written
     """
-    with open(out_path, "w", encoding="utf-8") as f:
-        for (w1, w2), pmi in sorted(pmi_scores.items(), key=lambda x: -x[1]):
-            f.write(f"{w1} {w2}\t{pmi:.6f}\n")
+    return result_writers.write_pmi(out_path, pmi_scores.items(), **options)
 
 
 # -----------------------------
 # Main
 # -----------------------------
 def main():
+    parser = argparse.ArgumentParser(description="PMI for val/test bigrams")
+    instrument.add_arguments(parser, stages=STAGES)
+    result_writers.add_arguments(parser, pmi=True)
+    artifact_cache.add_arguments(parser)
+    args = parser.parse_args()
+    instrument.configure(args, script="pmi")
+    cache = artifact_cache.from_args(args)
+    write_options = {"fmt": args.format, "chunk_rows": args.chunk_rows, "workers": args.workers,
+                     "run_rows": args.run_rows, "tmp_dir": args.tmp_dir}
+
     # create output directory if not exists
     (SCRIPT_DIR / "outputs").mkdir(parents=True, exist_ok=True)
     
     print("Loading unigram and bigram models...")
-    P_unigram = load_unigram_model(UNIGRAM_FILE)
-    P_bigram = load_bigram_model(BIGRAM_FILE)
+    with stage("load_models") as st:
+        # parsed probability tables are cached, keyed by the model files' content
+        models, hit = cache.get_or_compute(
+            "pmi_models", [UNIGRAM_FILE, BIGRAM_FILE], MODELS_PARAMS,
+            lambda: {"unigram": load_unigram_model(UNIGRAM_FILE),
+                     "bigram": load_bigram_model(BIGRAM_FILE)})
+        P_unigram = models["unigram"]
+        P_bigram = models["bigram"]
+        st.rows = len(P_unigram) + len(P_bigram)
+    if hit:
+        print("  (loaded from the artifact cache)")
 
     # Validation / val.txt
     print("Reading bigrams from val.txt ...")
-    val_bigrams = read_bigrams_from_corpus(VAL_FILE)
+    with stage("load_val") as st:
+        val_bigrams = read_bigrams_from_corpus(VAL_FILE)
+        st.rows = len(val_bigrams)
     print("Computing PMI for val bigrams...")
-    val_pmi = compute_pmi_for_bigrams(val_bigrams, P_unigram, P_bigram)
-    write_pmi_to_file(val_pmi, PMI_VAL_OUT)
-    print(f"PMI for val written to {PMI_VAL_OUT}")
+    with stage("pmi_val", rows=len(val_bigrams)):
+        val_pmi = compute_pmi_for_bigrams(val_bigrams, P_unigram, P_bigram)
+    with stage("write_val", rows=len(val_pmi)):
+        out = write_pmi_to_file(val_pmi, PMI_VAL_OUT, **write_options)
+    print(f"PMI for val written to {out}")
 
     # Test / test.txt
     print("Reading bigrams from test.txt ...")
-    test_bigrams = read_bigrams_from_corpus(TEST_FILE)
+    with stage("load_test") as st:
+        test_bigrams = read_bigrams_from_corpus(TEST_FILE)
+        st.rows = len(test_bigrams)
     print("Computing PMI for test bigrams...")
-    test_pmi = compute_pmi_for_bigrams(test_bigrams, P_unigram, P_bigram)
-    write_pmi_to_file(test_pmi, PMI_TEST_OUT)
-    print(f"PMI for test written to {PMI_TEST_OUT}")
+    with stage("pmi_test", rows=len(test_bigrams)):
+        test_pmi = compute_pmi_for_bigrams(test_bigrams, P_unigram, P_bigram)
+    with stage("write_test", rows=len(test_pmi)):
+        out = write_pmi_to_file(test_pmi, PMI_TEST_OUT, **write_options)
+    print(f"PMI for test written to {out}")
+    print(cache.summary())
+    instrument.finish()
 
 
 if __name__ == "__main__":
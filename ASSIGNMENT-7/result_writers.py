@@ -0,0 +1,300 @@
+"""
+Bulk writers for the ASSIGNMENT-7 result files.
+
+Rows are formatted a chunk at a time into one bytes block and written
+with one call, instead of one f-string and one write per row. Sentences
+are UTF-8 encoded once each rather than once per output row. The text
+output is byte-identical to the old line-by-line writers (lines end in
+\n on every platform). Chunks can be formatted in worker processes;
+they are still written in order.
+
+Besides text, results can be written as columnar files for downstream
+jobs:
+    neighbours: .npy (structured array query_index / neighbor_index /
+                similarity) or .parquet
+    PMI:        .parquet (w1 / w2 / pmi), rows in the same order as the text
+
+PMI rows are sorted by descending PMI. When there are more rows than
+run_rows, sorted runs are spilled to temporary files and merged with
+heapq.merge, so only one run is held in memory at a time.
+"""
+import heapq
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+CHUNK_ROWS = 50_000        # rows formatted / written per chunk
+PMI_RUN_ROWS = 1_000_000   # PMI rows sorted in memory before spilling a run
+
+NEIGHBOR_FORMATS = ("text", "npy", "parquet")
+PMI_FORMATS = ("text", "parquet")
+
+
+NEIGHBOR_DTYPE = np.dtype([("query_index", np.int64),
+                           ("neighbor_index", np.int64),
+                           ("similarity", np.float64)])
+
+
+def output_path(out_path, fmt):
+    """
+    Text keeps out_path; columnar formats swap the suffix.
+    """
+    out_path = Path(out_path)
+    if fmt == "text":
+        return out_path
+    return out_path.with_suffix("." + fmt)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("parquet output needs pyarrow (pip install pyarrow)")
+
+
+# -----------------------------
+# Chunked text writing
+# -----------------------------
+def _write_chunks(out_path, chunks, format_chunk, workers=1, initializer=None, initargs=()):
+    """
+    chunks: iterable of work items, format_chunk(item) -> bytes
+    With workers > 1 the chunks are formatted in a process pool (at most
+    2 * workers in flight) and written in their original order.
+    """
+    with open(out_path, "wb") as f:
+        if workers <= 1:
+            if initializer is not None:
+                initializer(*initargs)
+            for chunk in chunks:
+                f.write(format_chunk(chunk))
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                                 initargs=initargs) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(format_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    f.write(pending.popleft().result())
+            while pending:
+                f.write(pending.popleft().result())
+
+
+def _batched(iterable, n):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, n))
+        if not batch:
+            return
+        yield batch
+
+
+# -----------------------------
+# Nearest neighbours
+# -----------------------------
+def neighbor_arrays(neighbors):
+    """
+    neighbors: list of (query_index, neighbor_index, similarity)
+    Returns: (query_index, neighbor_index, similarity) numpy arrays
+    """
+    if len(neighbors) == 0:
+        return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.float64))
+    q, t, sim = zip(*neighbors)
+    return (np.asarray(q, dtype=np.int64), np.asarray(t, dtype=np.int64),
+            np.asarray(sim, dtype=np.float64))
+
+
+def cached_neighbors(cache, kind, inputs, params, compute):
+    """
+    Nearest neighbours from the artifact cache (artifact_cache.ArtifactCache),
+    keyed by the content of the TF-IDF files in inputs and by params;
+    compute() is only called on a miss. Stored as index / score arrays.
+    params must identify the search (algorithm, version, batch size...),
+    otherwise a changed search would keep returning the old neighbours.
+    Returns: (list of (query_index, neighbor_index, similarity), hit)
+    """
+    def compute_parts():
+        q, t, sim = neighbor_arrays(compute())
+        return {"query_index": q, "neighbor_index": t, "similarity": sim}
+
+    parts, hit = cache.get_or_compute(kind, inputs, params, compute_parts)
+    neighbors = list(zip(parts["query_index"].tolist(),
+                         parts["neighbor_index"].tolist(),
+                         parts["similarity"].tolist()))
+    return neighbors, hit
+
+
+# encoded sentence pieces of the current write, set once per worker process
+_sentences = None
+
+
+def _init_sentences(query_sents, target_sents):
+    global _sentences
+    heads = [f"\t{s}\t|||\t".encode("utf-8") for s in query_sents]
+    tails = [f"{s}\n".encode("utf-8") for s in target_sents]
+    _sentences = (heads, tails)
+
+
+def _format_neighbor_chunk(rows):
+    heads, tails = _sentences
+    out = []
+    append = out.append
+    for qi, ti, sim_ij in rows:
+        append(b"%d\t%d\t%.4f" % (qi, ti, sim_ij))
+        append(heads[qi])
+        append(tails[ti])
+    return b"".join(out)
+
+
+def write_neighbors(out_path, query_sents, target_sents, neighbors, fmt="text",
+                    chunk_rows=CHUNK_ROWS, workers=1):
+    """
+    neighbors: list of (query_index, neighbor_index, similarity)
+    fmt: "text" -> q<TAB>t<TAB>sim<TAB>query_sentence<TAB>|||<TAB>neighbor_sentence
+         "npy" / "parquet" -> index and score columns only
+    Returns: the path written
+    """
+    path = output_path(out_path, fmt)
+    if fmt == "text":
+        chunks = (neighbors[i:i + chunk_rows] for i in range(0, len(neighbors), chunk_rows))
+        _write_chunks(path, chunks, _format_neighbor_chunk, workers,
+                      _init_sentences, (query_sents, target_sents))
+        return path
+
+    q, t, sim = neighbor_arrays(neighbors)
+    if fmt == "npy":
+        table = np.empty(len(q), dtype=NEIGHBOR_DTYPE)
+        table["query_index"] = q
+        table["neighbor_index"] = t
+        table["similarity"] = sim
+        np.save(path, table)
+    elif fmt == "parquet":
+        _require_pyarrow()
+        table = pa.table({"query_index": q, "neighbor_index": t, "similarity": sim})
+        pq.write_table(table, path, row_group_size=chunk_rows)
+    else:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {NEIGHBOR_FORMATS}")
+    return path
+
+
+# -----------------------------
+# PMI
+# -----------------------------
+_pmi_value = itemgetter(1)
+
+
+def _spill_run(run, tmp_dir):
+    """
+    Pickles one sorted run to a temporary file, CHUNK_ROWS items per record.
+    Returns the file path.
+    """
+    fd, path = tempfile.mkstemp(prefix="pmi_run_", suffix=".pkl", dir=tmp_dir)
+    with os.fdopen(fd, "wb") as f:
+        for i in range(0, len(run), CHUNK_ROWS):
+            pickle.dump(run[i:i + CHUNK_ROWS], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def sorted_pmi(pmi_items, run_rows=PMI_RUN_ROWS, tmp_dir=None):
+    """
+    pmi_items: iterable of ((w1, w2), pmi), e.g. pmi_scores.items()
+    Yields the items by descending PMI, ties in input order (the same
+    order as sorted(..., key=lambda x: -x[1])).
+    Up to run_rows items are sorted in memory; beyond that sorted runs
+    are spilled to tmp_dir and k-way merged.
+    """
+    it = iter(pmi_items)
+    run = list(islice(it, run_rows))
+    # reverse=True keeps equal keys in input order, like key=-pmi
+    run.sort(key=_pmi_value, reverse=True)
+    tail = list(islice(it, 1))
+    if not tail:
+        yield from run
+        return
+
+    paths = []
+    try:
+        paths.append(_spill_run(run, tmp_dir))
+        run = tail + list(islice(it, run_rows - 1))
+        while run:
+            run.sort(key=_pmi_value, reverse=True)
+            paths.append(_spill_run(run, tmp_dir))
+            run = list(islice(it, run_rows))
+        # heapq.merge is stable across runs, and runs are in input order
+        yield from heapq.merge(*(_read_run(p) for p in paths), key=_pmi_value, reverse=True)
+    finally:
+        for p in paths:
+            os.remove(p)
+
+
+def _format_pmi_chunk(items):
+    return "".join([f"{w1} {w2}\t{pmi:.6f}\n" for (w1, w2), pmi in items]).encode("utf-8")
+
+
+def write_pmi(out_path, pmi_items, fmt="text", chunk_rows=CHUNK_ROWS, workers=1,
+              run_rows=PMI_RUN_ROWS, tmp_dir=None):
+    """
+    pmi_items: iterable of ((w1, w2), pmi)
+    fmt: "text" -> 'w1 w2<TAB>PMI' lines, "parquet" -> w1 / w2 / pmi columns;
+         both sorted by descending PMI
+    Returns: the path written
+    """
+    path = output_path(out_path, fmt)
+    rows = sorted_pmi(pmi_items, run_rows=run_rows, tmp_dir=tmp_dir)
+
+    if fmt == "text":
+        _write_chunks(path, _batched(rows, chunk_rows), _format_pmi_chunk, workers)
+    elif fmt == "parquet":
+        _require_pyarrow()
+        schema = pa.schema([("w1", pa.string()), ("w2", pa.string()), ("pmi", pa.float64())])
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in _batched(rows, chunk_rows):
+                pairs, pmi = zip(*batch)
+                w1, w2 = zip(*pairs)
+                writer.write_batch(pa.record_batch([list(w1), list(w2), list(pmi)], schema=schema))
+    else:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {PMI_FORMATS}")
+    return path
+
+
+# -----------------------------
+# Command line
+# -----------------------------
+def add_arguments(parser, pmi=False):
+    group = parser.add_argument_group("output")
+    formats = PMI_FORMATS if pmi else NEIGHBOR_FORMATS
+    group.add_argument("--format", choices=formats, default="text",
+                       help="text (default) or a columnar file next to the text path")
+    group.add_argument("--workers", type=int, default=1,
+                       help="processes formatting text chunks (default 1: no pool)")
+    group.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                       help="rows formatted and written per chunk / parquet row group")
+    if pmi:
+        group.add_argument("--run-rows", type=int, default=PMI_RUN_ROWS,
+                           help="PMI rows sorted in memory before spilling a sorted run")
+        group.add_argument("--tmp-dir", type=Path, default=None,
+                           help="directory for spilled runs (default: system temp)")
+    return parser
@@ -1,9 +1,19 @@
+import argparse
 import json
+import sys
 from pathlib import Path
 
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
 from scipy.sparse import save_npz
 
+import instrument
+from instrument import stage
+
+# the artifact cache is shared by all assignments and lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "artifact_cache"))
+import artifact_cache  # noqa: E402
+
 # ==============================
 # CONFIG – change filenames if needed
 # ==============================
@@ -14,6 +24,13 @@ TEST_FILE  = SCRIPT_DIR / "inputs/test.txt"
 
 OUT_DIR = SCRIPT_DIR / "outputs/tfidf_output"   # folder to save matrices + vocab
 
+# artifact cache key version of the matrices; bump it whenever
+# read_sentences or the vectorizer setup change
+TFIDF_VERSION = 1
+
+# instrumented stages (see instrument.py)
+STAGES = ("load", "cache_lookup", "vectorize_fit", "vectorize_transform", "write")
+
 
 def read_sentences(path):
     """
@@ -32,13 +49,22 @@ def read_sentences(path):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="TF-IDF vectors for train/val/test")
+    instrument.add_arguments(parser, stages=STAGES)
+    artifact_cache.add_arguments(parser)
+    args = parser.parse_args()
+    instrument.configure(args, script="tfidf")
+    cache = artifact_cache.from_args(args)
+
     # create output directory if not exists
     Path(OUT_DIR).mkdir(parents=True, exist_ok=True)
 
     print("Reading data...")
-    train_sents = read_sentences(TRAIN_FILE)
-    val_sents   = read_sentences(VAL_FILE)
-    test_sents  = read_sentences(TEST_FILE)
+    with stage("load") as st:
+        train_sents = read_sentences(TRAIN_FILE)
+        val_sents   = read_sentences(VAL_FILE)
+        test_sents  = read_sentences(TEST_FILE)
+        st.rows = len(train_sents) + len(val_sents) + len(test_sents)
 
     print(f"# train sentences: {len(train_sents)}")
     print(f"# val   sentences: {len(val_sents)}")
@@ -55,30 +81,50 @@ def main():
         token_pattern=None,   # required when using custom tokenizer
     )
 
-    print("\nFitting TF-IDF on TRAIN (learning IDF from train only)...")
-    X_train = vectorizer.fit_transform(train_sents)
-
-    print("Transforming VAL and TEST using train IDF...")
-    X_val = vectorizer.transform(val_sents)
-    X_test = vectorizer.transform(test_sents)
+    # same input files + same vectorizer settings -> reuse the matrices
+    params = {"vectorizer": vectorizer.get_params(), "sklearn": sklearn.__version__,
+              "version": TFIDF_VERSION}
+    key = cache.key("tfidf", [TRAIN_FILE, VAL_FILE, TEST_FILE], params)
+    with stage("cache_lookup"):
+        cached = cache.get(key)
+
+    if cached is not None:
+        print("\nTF-IDF matrices loaded from the artifact cache")
+        X_train, X_val, X_test = cached["train"], cached["val"], cached["test"]
+        vocab = cached["vocab"]
+    else:
+        print("\nFitting TF-IDF on TRAIN (learning IDF from train only)...")
+        with stage("vectorize_fit", rows=len(train_sents)):
+            X_train = vectorizer.fit_transform(train_sents)
+
+        print("Transforming VAL and TEST using train IDF...")
+        with stage("vectorize_transform", rows=len(val_sents) + len(test_sents)):
+            X_val = vectorizer.transform(val_sents)
+            X_test = vectorizer.transform(test_sents)
+
+        vocab = vectorizer.vocabulary_  # dict[token] = column_index
+        cache.put(key, {"train": X_train, "val": X_val, "test": X_test, "vocab": vocab},
+                  info={"kind": "tfidf", "params": params})
 
     # ==============================
     # Save outputs
     # ==============================
     print("\nSaving sparse TF-IDF matrices...")
-    save_npz(Path(OUT_DIR) / "tfidf_train.npz", X_train)
-    save_npz(Path(OUT_DIR) / "tfidf_val.npz", X_val)
-    save_npz(Path(OUT_DIR) / "tfidf_test.npz", X_test)
+    with stage("write", rows=X_train.shape[0] + X_val.shape[0] + X_test.shape[0]):
+        save_npz(Path(OUT_DIR) / "tfidf_train.npz", X_train)
+        save_npz(Path(OUT_DIR) / "tfidf_val.npz", X_val)
+        save_npz(Path(OUT_DIR) / "tfidf_test.npz", X_test)
 
-    print("Saving vocabulary (token -> column index)...")
-    vocab = vectorizer.vocabulary_  # dict[token] = column_index
-    with open(Path(OUT_DIR) / "vocab.json", "w", encoding="utf-8") as f:
-        json.dump(vocab, f, ensure_ascii=False, indent=2)
+        print("Saving vocabulary (token -> column index)...")
+        with open(Path(OUT_DIR) / "vocab.json", "w", encoding="utf-8") as f:
+            json.dump(vocab, f, ensure_ascii=False, indent=2)
 
     print("\nDone!")
     print(f"Train TF-IDF shape: {X_train.shape}")
     print(f"Val   TF-IDF shape: {X_val.shape}")
     print(f"Test  TF-IDF shape: {X_test.shape}")
+    print(cache.summary())
+    instrument.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+import math
+import random
+import re
+import time
+
+import numpy as np
+
+
+# -----------------------------
+# Preprocessing (same as Lab-8.ipynb)
+# -----------------------------
+def preprocess(sentences):
+    processed = []
+    for s in sentences:
+        s = s.lower()
+        s = re.sub(r'([.,!?])', r' \1 ', s)
+        s = re.sub(r'\s+', ' ', s).strip()
+        tokens = s.split()
+        processed.append(tokens)
+    return processed
+
+
+def flatten(sentence):
+    flat = []
+    for w in sentence:
+        if isinstance(w, list):
+            flat.extend(w)
+        else:
+            flat.append(w)
+    return flat
+
+
+def message_tokens(message):
+    """
+    Tokens exactly as the notebook's intent classifier sees them: there,
+    preprocess(sentences) is applied to a single string, so it runs over
+    the characters and the flattened result is the non-space characters.
+    """
+    return flatten(preprocess(message))
+
+
+# -----------------------------
+# Classifier
+# -----------------------------
+class NGramClassifier:
+    """
+    Multi-class n-gram language-model classifier.
+
+    All classes share one interned vocabulary and one n-gram / history
+    index; per-class counts live in aligned arrays of shape
+    (n_classes, n_items). Scoring is done for a whole batch of messages
+    against every class at once, in log space, with add-k smoothing:
+
+        P(w | h) = (c(h, w) + k) / (c(h) + k * V_class)
+
+    where V_class is the number of distinct tokens seen in that class
+    (same as sentence_probability in the notebook).
+    """
+
+    def __init__(self, n=2, k=1.0):
+        if n < 1:
+            raise ValueError("n must be >= 1")
+        self.n = n
+        self.k = k
+        self.labels = []
+        self.vocab = {}          # token -> id
+        self.ngram_index = {}    # tuple of token ids -> column in ngram_counts
+        self.history_index = {}  # tuple of token ids -> column in history_counts
+
+    def _intern(self, tokens, add):
+        vocab = self.vocab
+        if add:
+            return [vocab.setdefault(t, len(vocab)) for t in tokens]
+        return [vocab.get(t, -1) for t in tokens]
+
+    def _ngrams(self, ids):
+        n = self.n
+        return [tuple(ids[i:i + n]) for i in range(len(ids) - n + 1)]
+
+    def _histories(self, ids):
+        # history counts are (n-1)-gram counts over the whole sentence;
+        # for unigrams the single empty history counts every token
+        if self.n == 1:
+            return [()] * len(ids)
+        m = self.n - 1
+        return [tuple(ids[i:i + m]) for i in range(len(ids) - m + 1)]
+
+    def fit(self, data):
+        """
+        data: dict label -> list of token lists (one per message)
+        """
+        self.labels = list(data)
+        per_class = []
+        for label in self.labels:
+            ngrams, histories, types = [], [], set()
+            for tokens in data[label]:
+                ids = self._intern(flatten(tokens), add=True)
+                types.update(ids)
+                ngrams.extend(self.ngram_index.setdefault(g, len(self.ngram_index))
+                              for g in self._ngrams(ids))
+                histories.extend(self.history_index.setdefault(h, len(self.history_index))
+                                 for h in self._histories(ids))
+            per_class.append((ngrams, histories, len(types)))
+
+        C = len(self.labels)
+        self.ngram_counts = np.zeros((C, len(self.ngram_index)), dtype=np.float64)
+        self.history_counts = np.zeros((C, len(self.history_index)), dtype=np.float64)
+        self.class_vocab_size = np.zeros(C, dtype=np.float64)
+        for c, (ngrams, histories, n_types) in enumerate(per_class):
+            np.add.at(self.ngram_counts[c], np.asarray(ngrams, dtype=np.int64), 1)
+            np.add.at(self.history_counts[c], np.asarray(histories, dtype=np.int64), 1)
+            self.class_vocab_size[c] = n_types
+
+        # trailing zero column: the slot for unseen n-grams / histories
+        self.ngram_counts = np.hstack([self.ngram_counts, np.zeros((C, 1))])
+        self.history_counts = np.hstack([self.history_counts, np.zeros((C, 1))])
+        return self
+
+    def _positions(self, messages):
+        """
+        Maps every scored position of every message to column indices.
+        Returns: (ngram_cols, history_cols, message_index) int arrays.
+        """
+        unseen_g = len(self.ngram_index)
+        unseen_h = len(self.history_index)
+        g_cols, h_cols, owner = [], [], []
+        for m, tokens in enumerate(messages):
+            ids = self._intern(flatten(tokens), add=False)
+            grams = self._ngrams(ids)
+            for g in grams:
+                g_cols.append(self.ngram_index.get(g, unseen_g))
+                h_cols.append(self.history_index.get(g[:-1], unseen_h))
+            owner.extend([m] * len(grams))
+        return (np.asarray(g_cols, dtype=np.int64),
+                np.asarray(h_cols, dtype=np.int64),
+                np.asarray(owner, dtype=np.int64))
+
+    def log_scores(self, messages):
+        """
+        messages: list of token lists
+        Returns: array (n_messages, n_classes) of natural-log sentence probabilities.
+        """
+        g_cols, h_cols, owner = self._positions(messages)
+        k = self.k
+        V = self.class_vocab_size[:, None]
+        log_p = (np.log(self.ngram_counts[:, g_cols] + k)
+                 - np.log(self.history_counts[:, h_cols] + k * V))   # (C, positions)
+        scores = np.zeros((len(messages), len(self.labels)))
+        for c in range(len(self.labels)):
+            scores[:, c] = np.bincount(owner, weights=log_p[c], minlength=len(messages))
+        return scores
+
+    def predict(self, messages):
+        scores = self.log_scores(messages)
+        return [self.labels[c] for c in scores.argmax(axis=1)]
+
+
+def main():
+    Inform = ["Check out https://example.com for more info!", "Your package #12345 will arrive tomorrow.", "Download the report from https://reports.com."]
+    Reminder = ["Meeting at 3pm, don't forget to bring the files.", "The meeting is starting in 10 minutes.", "Reminder: submit your timesheet by 5pm today."]
+    Promo = ["Order 3 items, get 1 free! Limited offer!!!", "Win $1000 now, visit http://winbig.com!!!", "Exclusive deal for you: buy 2, get 1 free!!!"]
+
+    clf = NGramClassifier(n=2, k=1).fit({
+        "Inform": [message_tokens(s) for s in Inform],
+        "Reminder": [message_tokens(s) for s in Reminder],
+        "Promotion": [message_tokens(s) for s in Promo],
+    })
+
+    test_sentence = "You will get an exclusive offer in the meeting!"
+    scores = clf.log_scores([message_tokens(test_sentence)])[0]
+    print(" | ".join(f"{label}: {math.exp(s):.2e}" for label, s in zip(clf.labels, scores)))
+    print(f"Predicted class: {clf.labels[int(scores.argmax())]}")
+
+    # throughput on synthetic messages built from the training text
+    random.seed(42)
+    pool = Inform + Reminder + Promo + [test_sentence]
+    words = " ".join(pool).split()
+    batch = [message_tokens(" ".join(random.choices(words, k=random.randint(5, 15))))
+             for _ in range(10000)]
+    start = time.perf_counter()
+    clf.predict(batch)
+    elapsed = time.perf_counter() - start
+    print(f"\nClassified {len(batch):,} messages in {elapsed:.3f}s "
+          f"({len(batch) / elapsed:,.0f} messages/s)")
+
+
+if __name__ == "__main__":
+    main()
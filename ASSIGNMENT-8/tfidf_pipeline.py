@@ -0,0 +1,174 @@
+import math
+import re
+from collections import Counter
+
+try:
+    from scipy.sparse import csr_matrix
+except ImportError:  # scipy is only needed for tf_idf_matrix
+    csr_matrix = None
+
+
+# -----------------------------
+# Preprocessing (same as Lab-8.ipynb)
+# -----------------------------
+def preprocess(sentence):
+    # 1. Handle zero-width joiner
+    sentence = re.sub("\u200c", " ", sentence)
+
+    # 2. Replace URLs (http, https, www)
+    sentence = re.sub(r'https?://\S+|www\.\S+', '<URL>', sentence)
+
+    # 3. Replace numbers (any continuous digits)
+    sentence = re.sub(r'\d+', '<NUMBER>', sentence)
+
+    sentence = re.sub(r'[^\w\s]', ' <PUNCT> ', sentence)
+
+    sentence = sentence.lower()
+
+    tokens = sentence.split()
+
+    return tokens
+
+
+# -----------------------------
+# Document frequencies (one pass)
+# -----------------------------
+def compute_document_frequencies(sentences):
+    """
+    sentences: list of token lists
+    Returns: Counter word -> number of sentences containing word.
+    Each sentence is visited once, so this is linear in corpus size.
+    """
+    DF = Counter()
+    for sentence in sentences:
+        DF.update(set(sentence))
+    return DF
+
+
+def compute_tf_with_normalization(sentence, smoothing=False):
+    """
+    Same semantics as the notebook:
+    smoothing=False -> count / sentence length
+    smoothing=True  -> count / sum(1 + log(count))
+    """
+    TF = Counter(sentence)
+
+    if not smoothing:
+        length = len(sentence)
+        for key in TF:
+            TF[key] /= length
+    else:
+        denom = sum(1 + math.log(c) for c in TF.values())
+        for key in TF:
+            TF[key] /= denom
+
+    return dict(TF)
+
+
+def idf_from_df(DF, N, smoothing=False):
+    """
+    DF: word -> document frequency, N: number of sentences
+    smoothing=False -> log(N / df)
+    smoothing=True  -> log((1 + N) / (1 + df)) + 1
+    """
+    if not smoothing:
+        return {w: math.log(N / df) for w, df in DF.items()}
+    return {w: math.log((1 + N) / (1 + df)) + 1 for w, df in DF.items()}
+
+
+def compute_idf(sentence, sentences, smoothing=False, DF=None):
+    """
+    Drop-in for the notebook's compute_idf, backed by the DF table.
+    Pass a precomputed DF to avoid rescanning sentences.
+    """
+    if DF is None:
+        DF = compute_document_frequencies(sentences)
+    N = len(sentences)
+    return idf_from_df({w: DF[w] for w in sentence}, N, smoothing)
+
+
+# -----------------------------
+# TF-IDF
+# -----------------------------
+def compute_tf_idf_scores(sentences, smoothing=False):
+    """
+    Same output as the notebook: dict tuple(sentence) -> list of TF*IDF,
+    one value per distinct word in first-seen order.
+    IDF is computed once for the whole corpus instead of per sentence.
+    """
+    IDF = idf_from_df(compute_document_frequencies(sentences), len(sentences), smoothing)
+
+    TF_IDF = {}
+    for sentence in sentences:
+        TF = compute_tf_with_normalization(sentence, smoothing)
+        TF_IDF[tuple(sentence)] = [tf * IDF[word] for word, tf in TF.items()]
+
+    return TF_IDF
+
+
+def tf_idf_matrix(sentences, smoothing=False, vocab=None):
+    """
+    Sparse TF-IDF matrix, one row per sentence.
+    vocab: optional word -> column index; built in first-seen order if None.
+    Returns: (scipy.sparse.csr_matrix of shape (n_sentences, len(vocab)), vocab)
+    """
+    if csr_matrix is None:
+        raise ImportError("tf_idf_matrix requires scipy")
+
+    IDF = idf_from_df(compute_document_frequencies(sentences), len(sentences), smoothing)
+    if vocab is None:
+        vocab = {}
+        for sentence in sentences:
+            for word in sentence:
+                if word not in vocab:
+                    vocab[word] = len(vocab)
+
+    indptr = [0]
+    indices = []
+    data = []
+    for sentence in sentences:
+        TF = compute_tf_with_normalization(sentence, smoothing)
+        for word, tf in TF.items():
+            col = vocab.get(word)
+            if col is None:
+                continue
+            indices.append(col)
+            data.append(tf * IDF[word])
+        indptr.append(len(indices))
+
+    X = csr_matrix((data, indices, indptr), shape=(len(sentences), len(vocab)))
+    # without smoothing a word in every sentence has IDF 0; don't store those
+    X.eliminate_zeros()
+    X.sort_indices()
+    return X, vocab
+
+
+def main():
+    sentences = [
+        "Apple released the new iPhone 15 today! Visit https://apple.com",
+        "The price of the iPhone 15 is 799 dollars.",
+        "Check www.example.com for more details."
+    ]
+
+    preprocessed_sentences = [preprocess(s) for s in sentences]
+
+    print("=== Preprocessed Sentences ===")
+    for i, s in enumerate(preprocessed_sentences):
+        print(f"Sentence {i+1}: {s}")
+
+    tfidf_results = compute_tf_idf_scores(preprocessed_sentences, smoothing=False)
+
+    print("\n=== TF-IDF Scores (per sentence) ===")
+    for i, sentence_tokens in enumerate(preprocessed_sentences):
+        print(f"\nSentence {i+1}:")
+        tfidf_list = tfidf_results[tuple(sentence_tokens)]
+        for token, score in zip(sentence_tokens, tfidf_list):
+            print(f"{token:15} -> {score:.6f}")
+
+    if csr_matrix is not None:
+        X, vocab = tf_idf_matrix(preprocessed_sentences)
+        print(f"\nSparse TF-IDF matrix: shape={X.shape}, nnz={X.nnz}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import heapq
+import random
+import re
+import time
+from collections import Counter
+
+
+# -----------------------------
+# Reference (Lab-8.ipynb)
+# -----------------------------
+def preprocess(sentences):
+    processed = []
+    for s in sentences:
+        s = s.lower()
+        s = re.sub(r'([.,!?])', r' \1 ', s)
+        s = re.sub(r'\s+', ' ', s).strip()
+        tokens = s.split()
+        processed.append(tokens)
+    return processed
+
+
+def get_initial_vocab(sentences):
+    words = []
+    for sent in sentences:
+        for token in sent:
+            chars = list(token)
+            chars.append('##')
+            words.append(chars)
+    return words
+
+
+def get_pair_counts(word_sequences):
+    pairs = Counter()
+    for seq in word_sequences:
+        for i in range(len(seq)-1):
+            pair = (seq[i], seq[i+1])
+            pairs[pair] += 1
+    return pairs
+
+
+def merge_pair(pair_to_merge, word_sequences):
+    new_sequences = []
+    bigram = ''.join(pair_to_merge)
+    for seq in word_sequences:
+        i = 0
+        new_seq = []
+        while i < len(seq):
+            if i < len(seq)-1 and seq[i] == pair_to_merge[0] and seq[i+1] == pair_to_merge[1]:
+                new_seq.append(bigram)
+                i += 2
+            else:
+                new_seq.append(seq[i])
+                i += 1
+        new_sequences.append(new_seq)
+    return new_sequences
+
+
+def reference_merges(word_sequences, num_merges):
+    """
+    The notebook's merge loop: recount all pairs and rebuild every
+    sequence on each merge.
+    Returns: (vocab Counter, word_sequences, per-merge seconds)
+    """
+    vocab = Counter(''.join(seq) for seq in word_sequences)
+    timings = []
+    for _ in range(num_merges):
+        start = time.perf_counter()
+        pairs = get_pair_counts(word_sequences)
+        if not pairs:
+            break
+        most_freq_pair = pairs.most_common(1)[0][0]
+        word_sequences = merge_pair(most_freq_pair, word_sequences)
+        vocab[''.join(most_freq_pair)] += pairs[most_freq_pair]
+        timings.append(time.perf_counter() - start)
+    return vocab, word_sequences, timings
+
+
+# -----------------------------
+# Incremental merge engine
+# -----------------------------
+class WordPieceMerger:
+    """
+    All words are stored in one flat array of integer symbols with
+    next/prev links (a merged-away position becomes -1), plus an index
+    pair -> set of left positions. A merge only visits the occurrences
+    of the chosen pair and updates the neighbouring pairs by delta.
+
+    The best pair is kept in a lazy max-heap keyed by
+    (count, first position). Ties therefore break on the pair that
+    appears first in the corpus, which is exactly the order
+    Counter.most_common(1) uses in the notebook, so the merges (and the
+    final vocabulary) are identical for any num_merges.
+    """
+
+    def __init__(self, word_sequences):
+        self.symbols = []        # id -> string
+        self.symbol_ids = {}     # string -> id
+        self.vocab = Counter(''.join(seq) for seq in word_sequences)
+        self.merges = []
+        self.timings = []
+
+        self.sym = []
+        self.nxt = []
+        self.prv = []
+        for seq in word_sequences:
+            base = len(self.sym)
+            for k, ch in enumerate(seq):
+                self.sym.append(self._intern(ch))
+                self.prv.append(base + k - 1 if k > 0 else -1)
+                self.nxt.append(base + k + 1 if k < len(seq) - 1 else -1)
+
+        self.occ = {}            # (a, b) -> set of left positions
+        self.first = {}          # (a, b) -> lower bound on min(occ[(a, b)])
+        for i, j in enumerate(self.nxt):
+            if j != -1:
+                self._add(i, (self.sym[i], self.sym[j]))
+
+        self.heap = [(-len(s), self.first[p], p) for p, s in self.occ.items()]
+        heapq.heapify(self.heap)
+
+    def _intern(self, s):
+        sid = self.symbol_ids.get(s)
+        if sid is None:
+            sid = self.symbol_ids[s] = len(self.symbols)
+            self.symbols.append(s)
+        return sid
+
+    def _add(self, i, pair):
+        s = self.occ.get(pair)
+        if s is None:
+            self.occ[pair] = {i}
+            self.first[pair] = i
+        else:
+            s.add(i)
+            if i < self.first[pair]:
+                self.first[pair] = i
+
+    def _remove(self, i, pair):
+        # first[pair] may now be too small; it is fixed lazily in _pop_best
+        s = self.occ.get(pair)
+        if s is not None:
+            s.discard(i)
+
+    def _pop_best(self):
+        """
+        Returns the current best pair or None.
+        Heap entries are optimistic (never worse than the true key), so an
+        entry is accepted only once it matches the pair's real key.
+        """
+        heap = self.heap
+        while heap:
+            neg_count, first, pair = heapq.heappop(heap)
+            s = self.occ.get(pair)
+            if not s:
+                continue
+            true_first = self.first[pair]
+            if true_first not in s:
+                true_first = self.first[pair] = min(s)
+            if -neg_count == len(s) and first == true_first:
+                return pair
+            heapq.heappush(heap, (-len(s), true_first, pair))
+        return None
+
+    def step(self):
+        """
+        Performs one merge.
+        Returns: the merged (left, right) strings, or None if nothing is left to merge.
+        """
+        start = time.perf_counter()
+        pair = self._pop_best()
+        if pair is None:
+            return None
+
+        sym, nxt, prv = self.sym, self.nxt, self.prv
+        a, b = pair
+        positions = self.occ.pop(pair)
+        del self.first[pair]
+        merged = ''.join((self.symbols[a], self.symbols[b]))
+        new_id = self._intern(merged)
+        self.vocab[merged] += len(positions)
+
+        touched = set()
+        for i in sorted(positions):
+            j = nxt[i]
+            # an earlier overlapping merge (e.g. 'a a a') may have consumed i
+            if sym[i] != a or j == -1 or sym[j] != b:
+                continue
+            p = prv[i]
+            q = nxt[j]
+            if p != -1:
+                self._remove(p, (sym[p], a))
+            if q != -1:
+                self._remove(j, (b, sym[q]))
+
+            sym[i] = new_id
+            sym[j] = -1
+            nxt[i] = q
+            if q != -1:
+                prv[q] = i
+
+            if p != -1:
+                self._add(p, (sym[p], new_id))
+                touched.add((sym[p], new_id))
+            if q != -1:
+                self._add(i, (new_id, sym[q]))
+                touched.add((new_id, sym[q]))
+
+        for t in touched:
+            s = self.occ.get(t)
+            if s:
+                heapq.heappush(self.heap, (-len(s), self.first[t], t))
+
+        self.merges.append((self.symbols[a], self.symbols[b]))
+        self.timings.append(time.perf_counter() - start)
+        return self.merges[-1]
+
+    def run(self, num_merges):
+        for _ in range(num_merges):
+            if self.step() is None:
+                break
+        return self.vocab
+
+    def word_sequences(self):
+        """Current segmentation of every word, as lists of strings."""
+        sequences = []
+        seq = []
+        for i, s in enumerate(self.sym):
+            if s == -1:
+                continue
+            seq.append(self.symbols[s])
+            if self.nxt[i] == -1:
+                sequences.append(seq)
+                seq = []
+        return sequences
+
+
+def timing_report(timings, label):
+    if not timings:
+        return f"{label}: no merges"
+    total = sum(timings)
+    return (f"{label}: {len(timings)} merges in {total:.3f}s "
+            f"(avg {1000 * total / len(timings):.3f} ms/merge, "
+            f"last {1000 * timings[-1]:.3f} ms)")
+
+
+def main():
+    sentences = [
+        "The boy hugs the cat.",
+        "The boys are hugging the dogs.",
+        "The dogs are chasing the cats.",
+        "The dog and the cat sit quietly.",
+        "The boy is sitting on the dog."
+    ]
+    word_sequences = get_initial_vocab(preprocess(sentences))
+
+    num_merges = 20
+    merger = WordPieceMerger(word_sequences)
+    vocab = merger.run(num_merges)
+    ref_vocab, _, _ = reference_merges(word_sequences, num_merges)
+
+    print("Final WordPiece vocabulary:")
+    print(sorted(vocab.keys()))
+    print("Same as notebook loop:", vocab == ref_vocab)
+
+    # speed-up as num_merges grows, on a synthetic corpus
+    random.seed(42)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    stems = ["".join(random.choices(letters, k=random.randint(2, 7))) for _ in range(400)]
+    suffixes = ["", "s", "ing", "ed", "er", "ly"]
+    corpus = [[random.choice(stems) + random.choice(suffixes) for _ in range(12)]
+              for _ in range(1000)]
+    big = get_initial_vocab(corpus)
+    print(f"\nSynthetic corpus: {len(big):,} words")
+
+    for n in (20, 100, 300):
+        merger = WordPieceMerger(big)
+        merger.run(n)
+        ref_vocab, _, ref_timings = reference_merges(big, n)
+        print(f"\nnum_merges={n}  identical vocab: {merger.vocab == ref_vocab}")
+        print("  " + timing_report(ref_timings, "notebook   "))
+        print("  " + timing_report(merger.timings, "incremental"))
+
+
+if __name__ == "__main__":
+    main()
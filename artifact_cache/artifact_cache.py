@@ -0,0 +1,366 @@
+"""
+Persistent, content-addressed cache for intermediate artifacts
+(n-gram counts, probability tables, TF-IDF matrices, merges, HMM
+parameters...) shared by all assignments.
+
+An artifact is looked up by a key built from
+    kind + hash of every input file's content + the parameters (JSON),
+so a rerun with unchanged inputs is a cache hit, and editing an input
+or a parameter is a miss. File paths are not part of the key.
+
+Every artifact is a dict of named parts, each stored in a binary format
+that loads fast:
+    scipy sparse matrix -> .npz (uncompressed)
+    numpy array         -> .npy
+    anything else       -> .pkl (pickle, highest protocol)
+
+Layout:
+    <root>/objects/<key>/meta.json + one file per part
+    <root>/file_hashes.json   content hashes memoised by (size, mtime)
+
+Entries are written to a temporary directory and renamed into place.
+When the total size exceeds the budget, least recently used entries are
+removed (a hit refreshes an entry's meta.json mtime).
+
+    python artifact_cache/artifact_cache.py stats
+    python artifact_cache/artifact_cache.py evict --max-mb 500
+    python artifact_cache/artifact_cache.py clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+CACHE_VERSION = 1              # bump when the on-disk layout changes
+DEFAULT_DIR = REPO_DIR / ".artifact_cache"
+DEFAULT_MAX_MB = 2048
+
+# override the defaults without touching the scripts
+ENV_DIR = "NLP_LAB_CACHE_DIR"
+ENV_MAX_MB = "NLP_LAB_CACHE_MB"
+
+HASH_BLOCK = 1 << 20
+
+
+def file_digest(path):
+    """
+    Returns: hex blake2b digest of the file's content.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# -----------------------------
+# Part codecs
+# -----------------------------
+def _save_part(directory, name, value):
+    """Writes one part; returns its file name."""
+    if sp is not None and sp.issparse(value):
+        filename = f"{name}.npz"
+        sp.save_npz(directory / filename, value, compressed=False)
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        filename = f"{name}.npy"
+        np.save(directory / filename, value, allow_pickle=False)
+    else:
+        filename = f"{name}.pkl"
+        with open(directory / filename, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return filename
+
+
+def _load_part(path):
+    if path.suffix == ".npz":
+        return sp.load_npz(path)
+    if path.suffix == ".npy":
+        return np.load(path, allow_pickle=False)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _dir_size(directory):
+    return sum(p.stat().st_size for p in directory.iterdir() if p.is_file())
+
+
+# -----------------------------
+# Cache
+# -----------------------------
+class ArtifactCache:
+    """
+    root: cache directory (default $NLP_LAB_CACHE_DIR or <repo>/.artifact_cache)
+    max_mb: size budget (default $NLP_LAB_CACHE_MB or 2048)
+    enabled: False gives a cache that always misses and stores nothing,
+             so callers need no separate code path for --no-cache
+    """
+
+    def __init__(self, root=None, max_mb=None, enabled=True):
+        if root is None:
+            root = os.environ.get(ENV_DIR, DEFAULT_DIR)
+        if max_mb is None:
+            max_mb = float(os.environ.get(ENV_MAX_MB, DEFAULT_MAX_MB))
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._hashes = None
+
+    # ---- keys
+    def _hash_index_path(self):
+        return self.root / "file_hashes.json"
+
+    def _load_hash_index(self):
+        if self._hashes is None:
+            try:
+                with open(self._hash_index_path(), "r", encoding="utf-8") as f:
+                    self._hashes = json.load(f)
+            except (OSError, ValueError):
+                self._hashes = {}
+        return self._hashes
+
+    def input_digest(self, path):
+        """
+        Content hash of an input file, memoised by (size, mtime_ns) so
+        large unchanged inputs are not re-read on every run.
+        """
+        path = Path(path).resolve()
+        st = path.stat()
+        stamp = [st.st_size, st.st_mtime_ns]
+        index = self._load_hash_index() if self.enabled else {}
+        entry = index.get(str(path))
+        if entry is not None and entry["stamp"] == stamp:
+            return entry["digest"]
+
+        digest = file_digest(path)
+        if self.enabled:
+            index[str(path)] = {"stamp": stamp, "digest": digest}
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self._hash_index_path().with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp, self._hash_index_path())
+        return digest
+
+    def key(self, kind, inputs=(), params=None):
+        """
+        kind: artifact type, e.g. "tfidf" or "ngram_counts"
+        inputs: file paths whose content the artifact depends on (order matters)
+        params: JSON-serialisable parameters of the computation
+        Returns: key string "<kind>-<hex digest>"
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{CACHE_VERSION}\0{kind}\0".encode("utf-8"))
+        for path in inputs:
+            h.update(self.input_digest(path).encode("ascii"))
+            h.update(b"\0")
+        h.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+        return f"{kind}-{h.hexdigest()}"
+
+    # ---- lookup / store
+    def get(self, key):
+        """
+        Returns: dict name -> value, or None on a miss.
+        """
+        entry = self.objects / key
+        meta_path = entry / "meta.json"
+        if not self.enabled or not meta_path.exists():
+            self.misses += 1
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            parts = {name: _load_part(entry / filename)
+                     for name, filename in meta["parts"].items()}
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            # half-deleted or corrupt entry: drop it and recompute
+            shutil.rmtree(entry, ignore_errors=True)
+            self.misses += 1
+            return None
+        os.utime(meta_path)   # mark as recently used
+        self.hits += 1
+        return parts
+
+    def put(self, key, parts, info=None):
+        """
+        parts: dict name -> value (names become file names)
+        info: optional JSON-serialisable description kept in meta.json
+        """
+        if not self.enabled:
+            return
+        self.objects.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.objects))
+        try:
+            files = {name: _save_part(tmp, name, value) for name, value in parts.items()}
+            meta = {
+                "key": key,
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "parts": files,
+                "info": info,
+            }
+            with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2, default=str)
+            try:
+                os.replace(tmp, self.objects / key)
+            except OSError:
+                # another process stored the same key first; theirs is identical
+                pass
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+
+    def get_or_compute(self, kind, inputs, params, compute):
+        """
+        compute: function () -> dict name -> value, called on a miss
+        Returns: (parts, hit)
+        """
+        if not self.enabled:
+            return compute(), False
+        key = self.key(kind, inputs, params)
+        parts = self.get(key)
+        if parts is not None:
+            return parts, True
+        parts = compute()
+        self.put(key, parts, info={"kind": kind, "inputs": [str(p) for p in inputs],
+                                   "params": params})
+        return parts, False
+
+    # ---- housekeeping
+    def entries(self):
+        """
+        Returns: list of (last_used, size_bytes, path), oldest first.
+        """
+        if not self.objects.exists():
+            return []
+        out = []
+        for entry in self.objects.iterdir():
+            meta_path = entry / "meta.json"
+            if entry.name.startswith(".") or not meta_path.exists():
+                continue
+            out.append((meta_path.stat().st_mtime, _dir_size(entry), entry))
+        out.sort()
+        return out
+
+    def evict(self, max_bytes=None, keep=None):
+        """
+        Removes least recently used entries until the cache fits in
+        max_bytes (default: the cache's budget). The entry named keep is
+        never removed. Returns: number of entries removed.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._hashes = None
+
+    def summary(self):
+        if not self.enabled:
+            return "artifact cache: disabled"
+        return f"artifact cache: {self.hits} hit(s), {self.misses} miss(es) in {self.root}"
+
+
+# -----------------------------
+# Trained models
+# -----------------------------
+def cached_model(cache, kind, inputs, params, make, train):
+    """
+    Caches a trained model (FastBPE, WordPiece, HMMTagger...) by its
+    attributes rather than the pickled object, so it also works for
+    classes defined in a notebook.
+    make: () -> new untrained instance, e.g. lambda: HMMTagger(smoothing=1.0)
+    train: model -> None, trains the model in place
+    On a hit a fresh make() instance gets the cached attributes back and
+    train is not called.
+    Returns: (model, hit)
+    """
+    trained = []
+
+    def compute():
+        model = make()
+        train(model)
+        trained.append(model)
+        return {"state": vars(model)}
+
+    parts, hit = cache.get_or_compute(kind, inputs, params, compute)
+    if trained:
+        return trained[0], hit
+    model = make()
+    vars(model).update(parts["state"])
+    return model, hit
+
+
+# -----------------------------
+# Command line
+# -----------------------------
+def add_arguments(parser):
+    group = parser.add_argument_group("artifact cache")
+    group.add_argument("--no-cache", action="store_true",
+                       help="always recompute, do not read or write the artifact cache")
+    group.add_argument("--cache-dir", type=Path, default=None,
+                       help=f"cache directory (default ${ENV_DIR} or {DEFAULT_DIR})")
+    group.add_argument("--cache-mb", type=float, default=None,
+                       help=f"size budget in MB (default ${ENV_MAX_MB} or {DEFAULT_MAX_MB})")
+    return parser
+
+
+def from_args(args):
+    return ArtifactCache(root=args.cache_dir, max_mb=args.cache_mb, enabled=not args.no_cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the artifact cache")
+    parser.add_argument("command", choices=["stats", "evict", "clear"])
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--max-mb", type=float, default=None,
+                        help="budget for evict (default: the cache's budget)")
+    args = parser.parse_args()
+
+    cache = ArtifactCache(root=args.cache_dir, max_mb=args.max_mb)
+    if args.command == "clear":
+        cache.clear()
+        print(f"Removed {cache.root}")
+        return
+    if args.command == "evict":
+        removed = cache.evict()
+        print(f"Removed {removed} entr{'y' if removed == 1 else 'ies'}")
+
+    entries = cache.entries()
+    total = sum(size for _, size, _ in entries)
+    print(f"{cache.root}: {len(entries)} entries, {total / 2**20:.1f} MB "
+          f"(budget {cache.max_bytes / 2**20:g} MB)")
+    for last_used, size, entry in reversed(entries):
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(last_used))
+        print(f"  {stamp}  {size / 2**20:9.2f} MB  {entry.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import random
+from collections import Counter
+from itertools import accumulate
+
+LATIN = "abcdefghijklmnopqrstuvwxyz"
+TELUGU = "".join(chr(c) for c in range(0x0C15, 0x0C39))   # Telugu consonants
+
+TAGS = ["NN", "NNS", "NNP", "VB", "VBD", "VBZ", "JJ", "DT", "IN", "RB", "PRP", "CC", "CD", "."]
+
+# sentences / vocabulary size per scale
+SCALES = {
+    "small":  {"sentences": 200,   "vocab": 500},
+    "medium": {"sentences": 2000,  "vocab": 3000},
+    "large":  {"sentences": 10000, "vocab": 10000},
+}
+
+
+class SyntheticCorpus:
+    """
+    Zipf-distributed random words, so frequency statistics look like
+    natural text (a few very common words, a long tail).
+    """
+
+    def __init__(self, vocab_size, alphabet=LATIN, seed=42, zipf_s=1.1):
+        self.rng = random.Random(seed)
+        words = set()
+        while len(words) < vocab_size:
+            words.add("".join(self.rng.choices(alphabet, k=self.rng.randint(2, 9))))
+        self.vocab = sorted(words)
+        self.rng.shuffle(self.vocab)
+        weights = [1.0 / (rank ** zipf_s) for rank in range(1, vocab_size + 1)]
+        self.cum_weights = list(accumulate(weights))
+
+    def sentence(self, min_len=5, max_len=25):
+        n = self.rng.randint(min_len, max_len)
+        return self.rng.choices(self.vocab, cum_weights=self.cum_weights, k=n)
+
+    def sentences(self, n, min_len=5, max_len=25):
+        return [self.sentence(min_len, max_len) for _ in range(n)]
+
+    def lines(self, n, min_len=5, max_len=25):
+        """Space-joined sentences, the format of the assignment text files."""
+        return [" ".join(s) for s in self.sentences(n, min_len, max_len)]
+
+
+def tagged_sentences(corpus, n):
+    """
+    (word, tag) sentences for the HMM. Each word gets a fixed most-likely
+    tag and occasionally a random one, and tags follow a simple Markov chain.
+    """
+    rng = corpus.rng
+    word_tag = {w: rng.choice(TAGS) for w in corpus.vocab}
+    out = []
+    for sent in corpus.sentences(n):
+        out.append([(w, word_tag[w] if rng.random() < 0.9 else rng.choice(TAGS)) for w in sent])
+    return out
+
+
+def ngram_counts(sentences, max_n=4):
+    """
+    counts_dicts as used by kn_prob / katz_backoff_prob:
+    {n: {tuple(ngram): count}} with <s> / </s> padding.
+    """
+    counts = {n: Counter() for n in range(1, max_n + 1)}
+    for sent in sentences:
+        padded = ["<s>"] * (max_n - 1) + sent + ["</s>"]
+        for n in range(1, max_n + 1):
+            for i in range(len(padded) - n + 1):
+                counts[n][tuple(padded[i:i + n])] += 1
+    return {n: dict(c) for n, c in counts.items()}
+
+
+def unigram_bigram_probs(sentences):
+    """
+    P(w) and P(w1, w2) dicts in the shape pmi.py loads from the model files.
+    """
+    uni = Counter()
+    bi = Counter()
+    for sent in sentences:
+        uni.update(sent)
+        bi.update(zip(sent, sent[1:]))
+    total_uni = sum(uni.values())
+    total_bi = sum(bi.values())
+    return ({w: c / total_uni for w, c in uni.items()},
+            {b: c / total_bi for b, c in bi.items()})
+
+
+def bigram_counter(sentences):
+    counts = Counter()
+    for sent in sentences:
+        counts.update(zip(sent, sent[1:]))
+    return counts
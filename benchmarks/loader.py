@@ -0,0 +1,70 @@
+import ast
+import json
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# only these top-level statements are executed, so the notebooks' data
+# loading, training runs and prints are skipped
+KEEP_NODES = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)
+
+# also kept: sys.path set-up, so that shared modules the scripts import
+# (e.g. artifact_cache at the repository root) resolve
+KEEP_CALLS = ("sys.path.insert", "sys.path.append")
+
+
+def _keep(node):
+    if isinstance(node, KEEP_NODES):
+        return True
+    return (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+            and ast.unparse(node.value.func) in KEEP_CALLS)
+
+
+def _code_cells(path):
+    """
+    Yields source blocks: every code cell of a notebook, or the whole
+    file for a .py script. Shell / magic lines (!pip, %matplotlib) are dropped.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".ipynb":
+        with open(path, "r", encoding="utf-8") as f:
+            nb = json.load(f)
+        sources = ["".join(c["source"]) for c in nb["cells"] if c["cell_type"] == "code"]
+    else:
+        sources = [path.read_text(encoding="utf-8")]
+
+    for src in sources:
+        lines = [l for l in src.splitlines() if not l.lstrip().startswith(("!", "%"))]
+        yield "\n".join(lines)
+
+
+def load_definitions(path):
+    """
+    Imports, functions and classes defined in a notebook or script,
+    without running anything else in it.
+    path: relative to the repository root, or absolute
+    Returns: dict name -> object
+    """
+    path = Path(path)
+    if not path.is_absolute():
+        path = REPO_DIR / path
+
+    body = []
+    for src in _code_cells(path):
+        try:
+            tree = ast.parse(src)
+        except SyntaxError:
+            continue
+        body.extend(node for node in tree.body if _keep(node))
+
+    module = ast.Module(body=body, type_ignores=[])
+    namespace = {"__name__": f"bench:{path.stem}", "__file__": str(path)}
+    # scripts import their sibling modules (e.g. ASSIGNMENT-7's instrument)
+    script_dir = str(path.parent)
+    sys.path.insert(0, script_dir)
+    try:
+        exec(compile(module, str(path), "exec"), namespace)
+    finally:
+        sys.path.remove(script_dir)
+    return namespace
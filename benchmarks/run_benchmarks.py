@@ -0,0 +1,414 @@
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+
+from corpora import (SCALES, SyntheticCorpus, bigram_counter, ngram_counts,
+                     tagged_sentences, unigram_bigram_probs)
+from loader import load_definitions
+
+# ==============================
+# CONFIG – change paths if needed
+# ==============================
+SCRIPT_DIR = Path(__file__).parent
+RESULTS_DIR   = SCRIPT_DIR / "results"
+BASELINE_FILE = SCRIPT_DIR / "baseline.json"
+
+HMM_SRC       = "ASSIGNMENT-10/U23AI059_ASSINGMENT-10.ipynb"
+SUBWORD_SRC   = "ASSIGNMENT-9/U23AI059_ASSIGNMENT-9.IPYNB"
+KN_SRC        = "ASSIGNMENT-6/task2.ipynb"
+KATZ_SRC      = "ASSIGNMENT-6/U23AI059_1ST.ipynb"
+NN_SRC        = "ASSIGNMENT-7/nearest_neighbour.py"
+NN_TRAIN_SRC  = "ASSIGNMENT-7/code.py"
+PMI_SRC       = "ASSIGNMENT-7/pmi.py"
+TRIE_SRC      = "ASSIGNMENT-3/sample.py"
+
+TOLERANCE = 0.25      # allowed relative slow-down before a metric is flagged
+TIMEOUT   = 900       # seconds per case
+
+
+class Workload:
+    """
+    fn is timed once per entry of calls (each entry is an args tuple);
+    the whole list is run `repeat` times. units is the amount of work in
+    one pass over calls (tokens, sentences, lookups...).
+    """
+
+    def __init__(self, fn, calls, units, unit, repeat=1):
+        self.fn = fn
+        self.calls = calls
+        self.units = units
+        self.unit = unit
+        self.repeat = repeat
+
+
+# -----------------------------
+# Cases
+# -----------------------------
+def _corpus(scale):
+    return SyntheticCorpus(SCALES[scale]["vocab"])
+
+
+def case_hmm_train(scale):
+    HMMTagger = load_definitions(HMM_SRC)["HMMTagger"]
+    data = tagged_sentences(_corpus(scale), SCALES[scale]["sentences"])
+    return Workload(lambda: HMMTagger(smoothing=1.0).train(data), [()],
+                    units=sum(len(s) for s in data), unit="tokens", repeat=3)
+
+
+def case_hmm_viterbi(scale):
+    HMMTagger = load_definitions(HMM_SRC)["HMMTagger"]
+    corpus = _corpus(scale)
+    data = tagged_sentences(corpus, SCALES[scale]["sentences"])
+    tagger = HMMTagger(smoothing=1.0)
+    tagger.train(data)
+    test = [[w for w, _ in s] for s in tagged_sentences(corpus, min(300, len(data) // 5))]
+    return Workload(tagger.viterbi, [(s,) for s in test],
+                    units=sum(len(s) for s in test), unit="tokens")
+
+
+BPE_MERGES = {"small": 200, "medium": 1000, "large": 3000}
+
+
+def case_bpe_train(scale):
+    FastBPE = load_definitions(SUBWORD_SRC)["FastBPE"]
+    lines = _corpus(scale).lines(SCALES[scale]["sentences"])
+    return Workload(lambda: FastBPE().train(lines, num_merges=BPE_MERGES[scale]), [()],
+                    units=sum(len(l.split()) for l in lines), unit="words", repeat=3)
+
+
+def case_bpe_encode(scale):
+    FastBPE = load_definitions(SUBWORD_SRC)["FastBPE"]
+    corpus = _corpus(scale)
+    bpe = FastBPE()
+    bpe.train(corpus.lines(SCALES[scale]["sentences"]), num_merges=BPE_MERGES[scale])
+    test = corpus.lines(100)
+    return Workload(bpe.encode, [(l,) for l in test],
+                    units=sum(len(l.split()) for l in test), unit="words")
+
+
+WP_EXTRA = {"small": 50, "medium": 100, "large": 200}
+
+
+def case_wordpiece_train(scale):
+    WordPiece = load_definitions(SUBWORD_SRC)["WordPiece"]
+    corpus = _corpus(scale)
+    lines = corpus.lines(SCALES[scale]["sentences"])
+    vocab_size = len(set("".join(corpus.vocab))) + WP_EXTRA[scale]
+    return Workload(lambda: WordPiece().train(lines, vocab_size=vocab_size), [()],
+                    units=sum(len(l.split()) for l in lines), unit="words", repeat=3)
+
+
+def case_wordpiece_tokenize(scale):
+    WordPiece = load_definitions(SUBWORD_SRC)["WordPiece"]
+    corpus = _corpus(scale)
+    wp = WordPiece()
+    wp.train(corpus.lines(SCALES[scale]["sentences"]),
+             vocab_size=len(set("".join(corpus.vocab))) + WP_EXTRA[scale])
+    test = corpus.lines(500)
+    return Workload(wp.tokenize, [(l,) for l in test],
+                    units=sum(len(l.split()) for l in test), unit="words")
+
+
+NGRAM_QUERIES = {"small": 50, "medium": 20, "large": 10}
+
+
+def _ngram_workload(fn, scale, d):
+    corpus = _corpus(scale)
+    counts = ngram_counts(corpus.sentences(SCALES[scale]["sentences"]))
+    rng = corpus.rng
+    seen = list(counts[4])
+    queries = []
+    for i in range(NGRAM_QUERIES[scale]):
+        if i % 2:   # unseen quadgram -> exercises the backoff path
+            queries.append(tuple(rng.choice(corpus.vocab) for _ in range(4)))
+        else:
+            queries.append(rng.choice(seen))
+    return Workload(fn, [(q, counts, d) for q in queries], units=len(queries), unit="queries")
+
+
+def case_kn_prob(scale):
+    return _ngram_workload(load_definitions(KN_SRC)["kn_prob"], scale, 0.75)
+
+
+def case_katz_backoff_prob(scale):
+    return _ngram_workload(load_definitions(KATZ_SRC)["katz_backoff_prob"], scale, 0.5)
+
+
+def _tfidf(train_lines, query_lines=None):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(analyzer="word", tokenizer=str.split,
+                                 preprocessor=None, token_pattern=None)
+    X_train = vectorizer.fit_transform(train_lines)
+    if query_lines is None:
+        return X_train
+    return X_train, vectorizer.transform(query_lines)
+
+
+def case_find_nearest_neighbors(scale):
+    find_nearest_neighbors = load_definitions(NN_SRC)["find_nearest_neighbors"]
+    n = min(SCALES[scale]["sentences"], 3000)
+    X = _tfidf(_corpus(scale).lines(n))
+    return Workload(find_nearest_neighbors, [(X,)], units=n, unit="sentences", repeat=3)
+
+
+def case_find_nearest_neighbors_in_train(scale):
+    fn = load_definitions(NN_TRAIN_SRC)["find_nearest_neighbors_in_train"]
+    corpus = _corpus(scale)
+    n_train = SCALES[scale]["sentences"]
+    X_train, X_query = _tfidf(corpus.lines(n_train), corpus.lines(max(n_train // 10, 50)))
+    return Workload(fn, [(X_query, X_train, 500)], units=X_query.shape[0],
+                    unit="queries", repeat=3)
+
+
+def case_compute_pmi_for_bigrams(scale):
+    fn = load_definitions(PMI_SRC)["compute_pmi_for_bigrams"]
+    corpus = _corpus(scale)
+    P_unigram, P_bigram = unigram_bigram_probs(corpus.sentences(SCALES[scale]["sentences"]))
+    bigrams = bigram_counter(corpus.sentences(max(SCALES[scale]["sentences"] // 5, 50)))
+    return Workload(fn, [(bigrams, P_unigram, P_bigram)], units=len(bigrams),
+                    unit="bigrams", repeat=5)
+
+
+def _trie_words(scale):
+    corpus = _corpus(scale)
+    return [w for s in corpus.sentences(SCALES[scale]["sentences"]) for w in s]
+
+
+def case_trie_build(scale):
+    Trie = load_definitions(TRIE_SRC)["Trie"]
+    words = _trie_words(scale)
+
+    def build():
+        trie = Trie()
+        for w in words:
+            trie.insert(w)
+        for w in words:
+            trie.insert(w[::-1])
+
+    return Workload(build, [()], units=2 * len(words), unit="inserts", repeat=3)
+
+
+def case_trie_prefix_split(scale):
+    Trie = load_definitions(TRIE_SRC)["Trie"]
+    words = _trie_words(scale)
+    trie = Trie()
+    for w in words:
+        trie.insert(w)
+    distinct = sorted(set(words))
+    return Workload(trie.find_split_point, [(w,) for w in distinct],
+                    units=len(distinct), unit="words")
+
+
+def case_trie_suffix_split(scale):
+    defs = load_definitions(TRIE_SRC)
+    Trie, find_suffix_split = defs["Trie"], defs["find_suffix_split"]
+    words = _trie_words(scale)
+    trie = Trie()
+    for w in words:
+        trie.insert(w[::-1])
+    distinct = sorted(set(words))
+    return Workload(find_suffix_split, [(trie, w) for w in distinct],
+                    units=len(distinct), unit="words")
+
+
+CASES = {
+    "hmm_train": case_hmm_train,
+    "hmm_viterbi": case_hmm_viterbi,
+    "bpe_train": case_bpe_train,
+    "bpe_encode": case_bpe_encode,
+    "wordpiece_train": case_wordpiece_train,
+    "wordpiece_tokenize": case_wordpiece_tokenize,
+    "kn_prob": case_kn_prob,
+    "katz_backoff_prob": case_katz_backoff_prob,
+    "find_nearest_neighbors": case_find_nearest_neighbors,
+    "find_nearest_neighbors_in_train": case_find_nearest_neighbors_in_train,
+    "compute_pmi_for_bigrams": case_compute_pmi_for_bigrams,
+    "trie_build": case_trie_build,
+    "trie_prefix_split": case_trie_prefix_split,
+    "trie_suffix_split": case_trie_suffix_split,
+}
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_case(name, scale):
+    """
+    Runs in a fresh process so peak RSS belongs to this case only.
+    Setup (data generation, training for inference cases) is not timed.
+    """
+    workload = CASES[name](scale)
+    rss_after_setup = peak_rss_mb()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(workload.repeat):
+        for args in workload.calls:
+            t0 = time.perf_counter()
+            workload.fn(*args)
+            latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "case": name,
+        "scale": scale,
+        "status": "ok",
+        "unit": workload.unit,
+        "units": workload.units * workload.repeat,
+        "calls": len(latencies),
+        "seconds": total,
+        "throughput": workload.units * workload.repeat / total if total > 0 else 0.0,
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p99_ms": 1000 * percentile(latencies, 99),
+        "setup_rss_mb": rss_after_setup,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(name, scale, timeout):
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        future = pool.submit(run_case, name, scale)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            for proc in pool._processes.values():
+                proc.terminate()
+            return {"case": name, "scale": scale, "status": "timeout"}
+        except Exception as e:
+            return {"case": name, "scale": scale, "status": f"error: {e!r}"}
+
+
+# -----------------------------
+# Baseline comparison
+# -----------------------------
+def compare(results, baseline, tolerance):
+    """
+    Flags a case when throughput drops, or p99 latency / peak RSS grow,
+    by more than `tolerance` relative to the baseline.
+    Returns: list of (key, metric, baseline_value, current_value)
+    """
+    base = {f"{r['case']}@{r['scale']}": r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        key = f"{r['case']}@{r['scale']}"
+        b = base.get(key)
+        if b is None or b.get("status") != "ok":
+            continue
+        if r.get("status") != "ok":
+            regressions.append((key, "status", b["status"], r["status"]))
+            continue
+        if r["throughput"] < b["throughput"] * (1 - tolerance):
+            regressions.append((key, "throughput", b["throughput"], r["throughput"]))
+        if r["p99_ms"] > b["p99_ms"] * (1 + tolerance):
+            regressions.append((key, "p99_ms", b["p99_ms"], r["p99_ms"]))
+        if r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + tolerance):
+            regressions.append((key, "peak_rss_mb", b["peak_rss_mb"], r["peak_rss_mb"]))
+    return regressions
+
+
+def print_table(results):
+    print(f"{'case':<34}{'scale':<8}{'throughput':>18}{'p50 ms':>11}{'p99 ms':>11}{'peak MB':>10}")
+    print("-" * 92)
+    for r in results:
+        if r.get("status") != "ok":
+            print(f"{r['case']:<34}{r['scale']:<8}{r['status']:>18}")
+            continue
+        tput = f"{r['throughput']:,.0f} {r['unit']}/s"
+        print(f"{r['case']:<34}{r['scale']:<8}{tput:>18}{r['p50_ms']:>11.3f}"
+              f"{r['p99_ms']:>11.3f}{r['peak_rss_mb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NLP_LAB hot-path benchmarks")
+    parser.add_argument("--scale", action="append", choices=list(SCALES),
+                        help="corpus scale (repeatable, default: small)")
+    parser.add_argument("--case", action="append", choices=list(CASES),
+                        help="case to run (repeatable, default: all)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="results JSON (default: results/bench-<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    args = parser.parse_args()
+
+    if args.list:
+        for name in CASES:
+            print(name)
+        return 0
+
+    scales = args.scale or ["small"]
+    cases = args.case or list(CASES)
+
+    results = []
+    for scale in scales:
+        for name in cases:
+            print(f"[{scale}] {name} ...", flush=True)
+            results.append(run_isolated(name, scale, args.timeout))
+
+    print()
+    print_table(results)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    out = args.output or RESULTS_DIR / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+        return 0
+
+    print(f"\nREGRESSIONS against {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for key, metric, before, now in regressions:
+        print(f"  {key:<44} {metric:<12} {before} -> {now}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())